@@ -5,6 +5,29 @@ import nfl_data_py as nfl
 import openai
 from openai import OpenAI
 from streamlit_chat import message  # For chat interface
+from nflstats.defense import defense_to_date
+from nflstats.features import player_features
+from nflstats.insight_cache import replay_stream
+from nflstats.insights import insight_inputs
+from nflstats.leaderboards import ordinal
+from nflstats.loaders import (
+    get_defense_to_date,
+    get_fantasy_outcome_table,
+    get_fantasy_points,
+    get_insight_cache,
+    get_insight_client,
+    get_leaderboard,
+    get_matchup_cube,
+    get_next_games,
+    get_outcome_table,
+    get_player_features,
+    get_player_index,
+    get_usage_frame,
+)
+from nflstats.matchups import matchup_for
+from nflstats.schedule import next_game
+from nflstats.scoring import PRESETS
+from nflstats.usage import player_usage
 
 # Set the page layout to wide and add a title
 st.set_page_config(layout='wide', page_title='NFL Player Statistics Visualization')
@@ -46,69 +69,19 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-# Function to get player statistics
-@st.cache_data
-def get_player_stats():
-    seasons = list(range(2020, 2025))
-    df = nfl.import_weekly_data(seasons)
-    return df
-    
-@st.cache_data
-def get_schedule_data():
-    seasons = [selected_season]  # Only get data for the selected season
-    schedule_df = nfl.import_schedules(seasons)
-    return schedule_df
-    
-# Function to get roster data
-@st.cache_data
-def get_roster_data():
-    seasons = list(range(2024, 2025))
-    roster_df = nfl.import_seasonal_rosters(seasons)
-    return roster_df
-
-# Load the data
-df = get_player_stats()
-roster_df = get_roster_data()
-
-# Ensure player_id columns are of the same data type
-df['player_id'] = df['player_id'].astype(str)
-roster_df['player_id'] = roster_df['player_id'].astype(str)
-
-# Create 'full_name' by combining 'first_name' and 'last_name'
-if 'first_name' in roster_df.columns and 'last_name' in roster_df.columns:
-    roster_df['full_name'] = roster_df['first_name'] + ' ' + roster_df['last_name']
-    name_column = 'full_name'
-else:
-    st.error("First name and last name columns not found in roster_df.")
-    st.stop()
-
-# Merge player data with roster data to get full names, positions, and headshot URLs
-df = df.merge(
-    roster_df[['player_id', name_column, 'position', 'headshot_url', 'team']],
-    on='player_id',
-    how='left',
-    suffixes=('', '_roster')
-)
-
-# Determine which 'position' column to use
-if 'position_roster' in df.columns:
-    df['position'] = df['position_roster']
-    df.drop(columns=['position_roster'], inplace=True)
-elif 'position' in df.columns:
-    pass
-else:
-    st.error("'position' column not found after merging.")
+# Load the weekly stats merged with roster details (cached across reruns and sessions)
+try:
+    player_index = get_player_index()
+except ValueError as e:
+    st.error(str(e))
     st.stop()
-
-# Remove any duplicate rows
-df = df.drop_duplicates()
+name_column = 'full_name'
 
 # Sidebar for year and player selection
 st.sidebar.header('Selection')
 
 # Get available seasons
-available_seasons = df['season'].unique()
-available_seasons.sort()
+available_seasons = player_index.seasons
 
 # Set default selection to 2024 if available
 if 2024 in available_seasons:
@@ -118,12 +91,8 @@ else:
 
 selected_season = st.sidebar.selectbox('Select a Season (Year):', available_seasons, index=default_season_index)
 
-# Filter data for the selected season
-df_season = df[df['season'] == selected_season]
-
 # Get the list of players for the selected season
-player_names = df_season[name_column].dropna().unique()
-player_names.sort()
+player_names = player_index.players(selected_season)
 
 # Set default selection to 'Aaron Rodgers' if available
 if 'Aaron Rodgers' in player_names:
@@ -133,11 +102,15 @@ else:
 
 selected_player_name = st.sidebar.selectbox('Select a Player:', player_names, index=default_player_index)
 
-# Filter data for the selected player and season
-player_data = df_season[df_season[name_column] == selected_player_name]
+selected_scoring = st.sidebar.selectbox('Fantasy Scoring:', list(PRESETS))
+
+# Slice the player's games for the season, already sorted by week and deduplicated
+player_data = player_index.rows(selected_season, selected_player_name)
+# Fantasy points for the selected league, aligned to the player's rows by index
+player_data['fantasy_points'] = get_fantasy_points(selected_scoring)
 
 # Get player's information
-player_info = roster_df[roster_df['full_name'] == selected_player_name].iloc[0]
+player_info = player_index.info(selected_player_name, selected_season)
 headshot_url = player_info.get('headshot_url', '')
 position = player_info.get('position', 'N/A')
 team = player_info.get('team', 'N/A')
@@ -157,13 +130,6 @@ st.markdown(f"<p style='text-align: center;'><strong>Position</strong>: {positio
 if player_data.empty:
     st.warning('No data available for this player in the selected season.')
 else:
-    # Convert week number to integer for sorting
-    player_data['week'] = player_data['week'].astype(int)
-    player_data = player_data.sort_values(['week'])
-
-    # Remove any duplicate rows in player_data
-    player_data = player_data.drop_duplicates(subset=['season', 'week'])
-
     # Define metrics based on position
     position = position.upper()
     if position == 'QB':
@@ -191,23 +157,39 @@ else:
     else:
         metric_stats = {}
 
+    # Find the next game with an indexed lookup on (season, team, last week played)
+    last_week_played = int(player_data['week'].max())
+    upcoming_game = next_game(get_next_games(), selected_season, team, last_week_played)
+    if upcoming_game is not None:
+        next_week = int(upcoming_game['week'])
+        next_opponent = upcoming_game['opponent']
+    else:
+        next_week = None
+        next_opponent = None
+
     # Calculate averages over last 3 games and season
     if not metric_stats:
         st.warning('No metrics available for this position.')
     else:
-        # Calculate averages
-        last_3_games = player_data.tail(3)
-        season_avg = player_data.mean(numeric_only=True)
+        # Last-3 and season averages are precomputed for every player by the feature engine
+        feature_table = get_player_features()
+        # Season-to-date percentile within the position, through the latest week of the season
+        leaderboard = get_leaderboard()
+        through_week = leaderboard.last_weeks.get(int(selected_season), 0)
 
         # Display metrics below the player bio
         st.markdown("<h3 style='text-align: center;'>Recent Performance (last 3 games)</h3>", unsafe_allow_html=True)
         for metric_name, metric_column in metric_stats.items():
-            # Average over last 3 games
-            last_3_avg = last_3_games[metric_column].mean()
-            # Season average
-            season_avg_metric = season_avg.get(metric_column, 0)
+            features = player_features(feature_table, selected_season, selected_player_name, metric_column) or {}
+            last_3_avg = features.get('last_3', 0)
+            season_avg_metric = features.get('season_avg', 0)
             # Delta
             delta = last_3_avg - season_avg_metric
+            ranking = leaderboard.percentile(selected_season, through_week, selected_player_name, metric_column)
+            if ranking:
+                percentile_text = f"{ordinal(round(ranking['percentile']))} percentile of {ranking['position']}s (#{ranking['rank']} season total)"
+            else:
+                percentile_text = ''
 
             # Display metric with styling
             st.markdown(f"""
@@ -215,14 +197,33 @@ else:
                     <h4>{metric_name}</h4>
                     <p style='font-size: 24px; margin: 0;'>{last_3_avg:.1f}</p>
                     <p style='margin: 0; color: {"#28a745" if delta >= 0 else "#dc3545"};'>{delta:+.1f} vs Season Avg</p>
+                    <p style='margin: 0; color: #8b949e;'>{percentile_text}</p>
                 </div>
             """, unsafe_allow_html=True)
 
+        # Next opponent's defense against this position, as of the week before the game
+        if next_opponent:
+            matchup = matchup_for(get_matchup_cube(), selected_season, next_week - 1, next_opponent, position)
+            if matchup is not None:
+                st.markdown(f"<h3 style='text-align: center;'>Matchup: Week {next_week} vs {next_opponent}</h3>", unsafe_allow_html=True)
+                for metric_name, metric_column in metric_stats.items():
+                    if f'{metric_column}_avg' not in matchup:
+                        continue
+                    st.markdown(f"""
+                        <div style='text-align: center; margin-bottom: 10px;'>
+                            <h4>{metric_name} Allowed to {position}s</h4>
+                            <p style='font-size: 24px; margin: 0;'>{matchup[f'{metric_column}_avg']:.1f} per game</p>
+                            <p style='margin: 0;'>Rank {matchup[f'{metric_column}_rank']:.0f} (1 = most allowed)</p>
+                        </div>
+                    """, unsafe_allow_html=True)
+            else:
+                st.caption(f"No defense-vs-{position} numbers for {next_opponent} yet.")
+
     # Box Score
     st.markdown("<h3 style='text-align: center;'>Game-by-Game Stats</h3>", unsafe_allow_html=True)
     # Select columns to display
     box_score_columns = [
-        'week', 'game_date', 'opponent_team', 'fantasy_points_ppr',
+        'week', 'game_date', 'opponent_team', 'fantasy_points',
         'passing_yards', 'passing_tds', 'interceptions',
         'rushing_yards', 'rushing_tds',
         'receiving_yards', 'receiving_tds', 'receptions', 'targets'
@@ -230,7 +231,7 @@ else:
     # Filter columns that exist in player_data
     box_score_columns = [col for col in box_score_columns if col in player_data.columns]
     box_score_df = player_data[box_score_columns]
-    box_score_df = box_score_df.sort_values('week')
+    box_score_df = box_score_df.sort_values('week').rename(columns={'fantasy_points': f'fantasy_points ({selected_scoring})'})
     box_score_df.set_index('week', inplace=True)
 
     # Format date column if it exists
@@ -239,6 +240,21 @@ else:
 
     st.dataframe(box_score_df)
 
+    # Usage shares and red-zone work, aggregated from play-by-play
+    usage_df = player_usage(get_usage_frame(), selected_season, str(player_data['player_id'].iloc[0]))
+    if not usage_df.empty:
+        st.markdown("<h3 style='text-align: center;'>Usage</h3>", unsafe_allow_html=True)
+        usage_columns = {
+            'week': 'Week',
+            'target_share': 'Target Share',
+            'air_yards_share': 'Air Yards Share',
+            'wopr': 'WOPR',
+            'carry_share': 'Carry Share',
+            'red_zone_touches': 'Red Zone Touches',
+            'goal_line_carries': 'Goal Line Carries',
+        }
+        st.dataframe(usage_df[list(usage_columns)].rename(columns=usage_columns).set_index('Week'))
+
     # Create a container for the chart
     chart_container = st.container()
 
@@ -252,8 +268,9 @@ else:
     fixed_line_value = st.text_input('Enter Betting Line (Optional):', key='betting_line')
 
     # Select statistic to plot
-    selected_display_stat = st.selectbox('Select a Statistic to Plot:', list(metric_stats.keys()))
-    selected_category = metric_stats[selected_display_stat]
+    chart_stats = {**metric_stats, f'Fantasy Points ({selected_scoring})': 'fantasy_points'}
+    selected_display_stat = st.selectbox('Select a Statistic to Plot:', list(chart_stats.keys()))
+    selected_category = chart_stats[selected_display_stat]
 
     # Create a copy of player_data to avoid SettingWithCopyWarning
     plot_data = player_data.copy()
@@ -265,15 +282,24 @@ else:
     if fixed_line_value:
         try:
             value = float(fixed_line_value)
-            # Compute over/under stats
+            # Over/under stats from the presorted outcomes, one binary search per line
+            if selected_category == 'fantasy_points':
+                # Points depend on the league's rules, so each preset has its own shared table
+                outcome_table = get_fantasy_outcome_table(selected_scoring)
+            else:
+                outcome_table = get_outcome_table()
+            hit_rate = outcome_table.over(selected_season, selected_player_name, selected_category, value)
+            weeks_over = int(hit_rate['hits'])
+            total_weeks = int(hit_rate['games'])
             plot_data['over_line'] = plot_data[selected_category] > value
-            weeks_over = plot_data['over_line'].sum()
-            total_weeks = plot_data['over_line'].count()
 
             # Display feedback with a big green arrow if positive
             percentage_over = (weeks_over / total_weeks) * 100 if total_weeks > 0 else 0
             arrow = "⬆️" if weeks_over > (total_weeks / 2) else "⬇️"
             st.success(f"{arrow} **{selected_player_name} exceeded the line in {weeks_over}/{total_weeks} weeks ({percentage_over:.1f}% of games).**")
+            if total_weeks > 0:
+                st.caption(f"Recency-weighted P(over): {float(hit_rate['p_over_weighted']):.1%} | "
+                           f"Fair decimal odds: {float(hit_rate['fair_odds']):.2f}")
 
             # Add the player's performance line with conditional marker colors
             fig.add_trace(go.Scatter(
@@ -304,143 +330,43 @@ else:
             if st.button("Generate AI Insight"):
                 with st.spinner("Generating AI Insight..."):
                     # Perform calculations before the API call to limit tokens
-                    recent_performance = last_3_games[selected_category].mean()
-                    season_performance = player_data[selected_category].mean()
+                    features = player_features(get_player_features(), selected_season, selected_player_name, selected_category) or {}
+                    # Fantasy points are league-specific, so they are averaged here rather than precomputed
+                    recent_performance = features.get('last_3', plot_data[selected_category].tail(3).mean())
+                    season_performance = features.get('season_avg', plot_data[selected_category].mean())
                     total_games = player_data.shape[0]
                     games_over_line = plot_data[plot_data[selected_category] > float(fixed_line_value)].shape[0]
                     percentage_over_line = (games_over_line / total_games) * 100 if total_games > 0 else 0
     
-                    # Get the next opponent
-                    # Get schedule data
-                    # Get schedule data
-                    schedule_df = get_schedule_data()
-                    schedule_season = schedule_df[schedule_df['season'] == selected_season]
-    
-                    # Get weeks played so far
-                    weeks_played = player_data['week'].astype(int).unique()
-                    weeks_played.sort()
-                    if len(weeks_played) > 0:
-                        last_week_played = weeks_played.max()
+                    # Look up the next opponent's defensive averages up to the last week played
+                    if next_opponent:
+                        allowed = defense_to_date(get_defense_to_date(), selected_season, next_opponent, last_week_played)
                     else:
-                        last_week_played = 0
+                        allowed = None
     
-                    # Find next game
-                    team_schedule = schedule_season[
-                        ((schedule_season['home_team'] == team) | (schedule_season['away_team'] == team)) &
-                        (schedule_season['week'] > last_week_played)
-                    ].sort_values('week')
+                    inputs = insight_inputs(
+                        selected_player_name, position, team, selected_display_stat, fixed_line_value,
+                        selected_season, next_week, next_opponent,
+                        recent_performance, season_performance, percentage_over_line, total_games, allowed
+                    )
     
-                    if not team_schedule.empty:
-                        next_game = team_schedule.iloc[0]
-                        next_week = next_game['week']
-                        if next_game['home_team'] == team:
-                            opponent_team = next_game['away_team']
-                        else:
-                            opponent_team = next_game['home_team']
+                    # Replay a cached answer for identical inputs instead of calling the API again
+                    insight_cache = get_insight_cache()
+                    cached_response = insight_cache.get(inputs)
+                    if cached_response is not None:
+                        st.write_stream(replay_stream(cached_response))
                     else:
-                        opponent_team = None
-    
-                    if opponent_team:
-                        # Get opponent's defensive stats up to the current week
-                        # Calculate points allowed per game by the opponent defense
-                        opponent_games = schedule_season[
-                            ((schedule_season['home_team'] == opponent_team) | (schedule_season['away_team'] == opponent_team)) &
-                            (schedule_season['week'] <= last_week_played)
-                        ]
-    
-                        if not opponent_games.empty:
-                            # Calculate points allowed by opponent_team in each game
-                            def calculate_points_allowed(row):
-                                if row['home_team'] == opponent_team:
-                                    return row['away_score']
-                                else:
-                                    return row['home_score']
-    
-                            opponent_games['points_allowed'] = opponent_games.apply(calculate_points_allowed, axis=1)
-                            avg_points_allowed = opponent_games['points_allowed'].mean()
-                        else:
-                            avg_points_allowed = 0
-    
-                        # Get all games where the opponent_team was playing defense
-                        opponent_defense_games = df_season[
-                            (df_season['opponent_team'] == opponent_team) &  # They played against the opponent_team
-                            (df_season['week'] <= last_week_played)  # Only up to the last week played
-                        ]
-    
-                        # Calculate total offensive stats per team per week against the opponent_team
-                        offensive_stats = opponent_defense_games.groupby(['team', 'week']).agg({
-                            'passing_yards': 'sum',
-                            'rushing_yards': 'sum',
-                            'receiving_yards': 'sum',
-                        }).reset_index()
-    
-                        total_defensive_games = offensive_stats['week'].nunique()
-    
-                        if total_defensive_games > 0:
-                            # Now calculate average yards allowed per game
-                            avg_passing_yards_allowed = offensive_stats['passing_yards'].mean()
-                            avg_rushing_yards_allowed = offensive_stats['rushing_yards'].mean()
-                            avg_receiving_yards_allowed = offensive_stats['receiving_yards'].mean()
+                        # Stream with first-token and total deadlines; falls back to a local summary
+                        status = {}
+                        response = st.write_stream(get_insight_client().stream(inputs, status))
+                        if status['source'] == 'llm':
+                            insight_cache.put(inputs, response)
                         else:
-                            avg_passing_yards_allowed = 0
-                            avg_rushing_yards_allowed = 0
-                            avg_receiving_yards_allowed = 0
-                    else:
-                        opponent_team = "Unknown"
-                        avg_points_allowed = "N/A"
-                        avg_passing_yards_allowed = "N/A"
-                        avg_rushing_yards_allowed = "N/A"
-                        avg_receiving_yards_allowed = "N/A"
-    
-                    # Prepare a concise prompt
-                    prompt = f"""
-        You are a sports analyst.
-    
-        Provide a concise analysis on the likelihood of {selected_player_name} ({position}, {team}) exceeding {float(fixed_line_value)} {selected_display_stat} in the upcoming game against {opponent_team}.
-    
-        Consider the following statistics:
-    
-        - **Average {selected_display_stat} over the last 3 games**: {recent_performance:.1f}
-        - **Season average {selected_display_stat}**: {season_performance:.1f}
-        - **Percentage of games over {float(fixed_line_value)} {selected_display_stat}**: {percentage_over_line:.1f}%
-        - **Total games played this season**: {total_games}
-    
-        Opponent's defensive stats:
-    
-        - {opponent_team} allows an average of:
-        - **Passing yards allowed per game**: {avg_passing_yards_allowed:.1f}
-        - **Rushing yards allowed per game**: {avg_rushing_yards_allowed:.1f}
-        - **Receiving yards allowed per game**: {avg_receiving_yards_allowed:.1f}
-        - **Points allowed per game**: {avg_points_allowed:.1f}
-    
-        Do not mention previous injuries or factors not included in the data.
-    
-        Conclude with a clear and concise recommendation on whether it is likely or unlikely that {selected_player_name} will exceed the betting line, supported by the data provided. Bold the key statistics in your response.
-        """
-    
-                    
-    
-                    # Initialize OpenAI API
-                    key = st.secrets["OPENAI_API_KEY"]
-                    client=OpenAI(api_key=st.secrets.OPENAI_API_KEY)
+                            st.caption("AI service unavailable - showing a summary generated from the statistics.")
     
-                    # Make API call to OpenAI GPT
-                    try:
-                        stream = client.chat.completions.create(
-                            model="gpt-4o",
-                            messages=[
-                                {'role': 'system', 'content': 'you are a helpful assistant'},
-                                {"role": "user", "content": prompt}
-                            ],
-                            
-                            temperature=0.7,
-                            n=1,
-                            stop=None,
-                            stream=True
-                        )
-                        response = st.write_stream(stream)
-                    except Exception as e:
-                        st.error(f"An error occurred: {e}")
+                    cache_stats = insight_cache.stats()
+                    st.caption(f"Insight cache hit rate: {cache_stats['hit_rate']:.0%} "
+                               f"({cache_stats['hits']} hits, {cache_stats['misses']} misses)")
 
 
         except ValueError:
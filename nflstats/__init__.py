@@ -0,0 +1 @@
+# Shared data and analysis helpers for the NFL pages
@@ -0,0 +1,168 @@
+"""Walk-forward backtests of over-betting strategies, 2020-2024.
+
+Every (season, player, stat, week) row gets features from that player's
+earlier games in the season only: games played, season-to-date average,
+last-3 average and the hit rate of earlier games against this week's
+line. The features come from grouped cumulative sums and a self-join, not
+a loop over weeks. Strategies are boolean masks over those features.
+Seasons are independent, so they run in parallel.
+
+Lines are stored closing lines (odds_history.closing_lines) where we have
+them. Otherwise the line is a proxy just above the median of the
+player's earlier games, priced at PROXY_PRICE. The proxy only gives every
+row a line. It is not a market price, so results on proxy lines are
+reported separately and are not evidence of a betting edge.
+
+    python -m nflstats.backtest --seasons 2020 2021 2022 2023 2024
+"""
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from nflstats import odds_history, pipeline, store
+from nflstats.features import long_outcomes
+from nflstats.props import normalize_player_names
+from nflstats.screener import MARKET_STATS
+
+# Decimal price of a standard -110 line, used for proxy lines
+PROXY_PRICE = 1.91
+# Games a player needs earlier in the season before any strategy bets
+MIN_GAMES = 3
+
+STRATEGIES = {
+    'always_over': lambda f: f['games_before'] >= MIN_GAMES,
+    'last3_10pct_over_season': lambda f: f['last_3'] > f['season_avg'] * 1.10,
+    'last3_25pct_over_season': lambda f: f['last_3'] > f['season_avg'] * 1.25,
+    'hit_rate_over_implied': lambda f: f['hit_rate'] > f['implied_prob'],
+    'hit_rate_5pts_over_implied': lambda f: f['hit_rate'] > f['implied_prob'] + 0.05,
+}
+
+
+def historical_lines(conn, schedule_df):
+    """Stored closing lines keyed by (season, week, player_key, stat)."""
+    lines = odds_history.closing_lines(conn)
+    lines = lines[lines['market'].isin(MARKET_STATS)].copy()
+    lines['stat'] = lines['market'].map(MARKET_STATS)
+    # A game date belongs to exactly one (season, week)
+    dates = schedule_df[['gameday', 'season', 'week']].drop_duplicates(subset='gameday')
+    lines = lines.merge(dates, on='gameday', how='inner')
+    return lines[['season', 'week', 'player_key', 'stat', 'line', 'price']].astype({'season': 'int64', 'week': 'int64'})
+
+
+def season_features(long, lines=None):
+    """Walk-forward features and the line for every row of one season's long outcomes."""
+    f = long.copy()
+    grouped = f.groupby(['player', 'stat'], sort=False)
+    f['games_before'] = grouped.cumcount()
+    # Sum of strictly earlier games; differences of it give any trailing window
+    sum_before = grouped['value'].cumsum() - f['value']
+    f['season_avg'] = sum_before / f['games_before'].where(f['games_before'] > 0)
+    f['last_3'] = (sum_before - sum_before.groupby([f['player'], f['stat']]).shift(3)) / 3
+    # Median of strictly earlier games; a proxy at the mean sits below a skewed stat's median and favours overs
+    median = grouped['value'].expanding().median().droplevel([0, 1]).reindex(f.index)
+    f['median_before'] = median.groupby([f['player'], f['stat']]).shift()
+
+    f['player_key'] = normalize_player_names(f['player'])
+    f['line'] = np.floor(f['median_before']) + 0.5
+    f['price'] = PROXY_PRICE
+    f['line_source'] = 'proxy'
+    if lines is not None and len(lines):
+        f = f.merge(lines.rename(columns={'line': 'book_line', 'price': 'book_price'}),
+                    on=['season', 'week', 'player_key', 'stat'], how='left')
+        booked = f['book_line'].notna()
+        f.loc[booked, 'line'] = f.loc[booked, 'book_line']
+        f.loc[booked, 'price'] = f.loc[booked, 'book_price']
+        f.loc[booked, 'line_source'] = 'book'
+        f = f.drop(columns=['book_line', 'book_price'])
+    f['implied_prob'] = 1.0 / f['price']
+
+    # Hit rate of each earlier game against this week's line, via a self-join on (player, stat)
+    f['row'] = np.arange(len(f))
+    earlier = f[['row', 'player', 'stat', 'week', 'line']].merge(
+        f[['player', 'stat', 'week', 'value']].rename(columns={'week': 'earlier_week', 'value': 'earlier_value'}),
+        on=['player', 'stat'],
+    )
+    earlier = earlier[earlier['earlier_week'] < earlier['week']]
+    hits = (earlier['earlier_value'] > earlier['line']).groupby(earlier['row']).mean()
+    f['hit_rate'] = f['row'].map(hits)
+    return f.drop(columns=['row'])
+
+
+def backtest_season(long, lines=None, strategies=None):
+    """Every bet each strategy makes in one season, with its profit per unit stake."""
+    strategies = strategies or STRATEGIES
+    f = season_features(long, lines)
+    eligible = (f['games_before'] >= MIN_GAMES) & f['line'].notna()
+    # Integer book lines can push, which returns the stake
+    profit = np.where(f['value'] > f['line'], f['price'] - 1.0, np.where(f['value'] == f['line'], 0.0, -1.0))
+    bets = []
+    for name, rule in strategies.items():
+        mask = eligible & rule(f).fillna(False).astype(bool)
+        taken = f.loc[mask, ['season', 'week', 'player', 'stat', 'line', 'price', 'line_source', 'value']]
+        bets.append(taken.assign(strategy=name, profit=profit[mask.to_numpy()]))
+    return pd.concat(bets, ignore_index=True)
+
+
+def summarize(bets):
+    """Bets, hit rate, profit, ROI and max drawdown per (strategy, line source), in units of one stake.
+
+    Book and proxy lines are never pooled: only the 'book' rows measure a
+    strategy against prices that were actually offered.
+    """
+    keys = ['strategy', 'line_source']
+    bets = bets.sort_values(keys + ['season', 'week'], kind='stable')
+    # Drawdown is measured on profit settled week by week
+    weekly = bets.groupby(keys + ['season', 'week'], sort=False)['profit'].sum()
+    cumulative = weekly.groupby(level=keys).cumsum()
+    drawdown = (cumulative.groupby(level=keys).cummax().clip(lower=0) - cumulative).groupby(level=keys).max()
+
+    grouped = bets.groupby(keys)
+    summary = pd.DataFrame({
+        'bets': grouped.size(),
+        'hit_rate': grouped['profit'].apply(lambda p: (p > 0).mean()),
+        'profit': grouped['profit'].sum(),
+    })
+    summary['roi'] = summary['profit'] / summary['bets']
+    summary['max_drawdown'] = drawdown
+    return summary.sort_values(['line_source', 'roi'], ascending=[True, False])
+
+
+def run(seasons=None, workers=None, lines=None):
+    """Backtest every strategy over the seasons, one process per season. Returns (bets, summary)."""
+    seasons = seasons or store.SEASONS
+    player_index = pipeline.load_player_index()
+    long = long_outcomes(player_index.frame, player_index.name_column)
+    parts = [long[long['season'] == season] for season in seasons]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        bets = pd.concat(pool.map(partial(backtest_season, lines=lines), parts), ignore_index=True)
+    return bets, summarize(bets)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--seasons', type=int, nargs='+', default=store.SEASONS)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--proxy-only', action='store_true', help='Ignore stored closing lines')
+    parser.add_argument('--output', default=None, help='Write every bet to this CSV')
+    args = parser.parse_args(argv)
+
+    lines = None
+    if not args.proxy_only and odds_history.DB_PATH.exists():
+        lines = historical_lines(odds_history.connect(), store.load('schedules', store.SEASONS))
+    started = time.perf_counter()
+    bets, summary = run(args.seasons, args.workers, lines)
+    print(f'{len(bets)} bets over {len(args.seasons)} seasons in {time.perf_counter() - started:.1f}s')
+    print(summary.to_string())
+    if (summary.index.get_level_values('line_source') == 'proxy').any():
+        print('Proxy rows are priced against a line derived from the player\'s own history, '
+              'not a market line, so their ROI is not a betting edge.')
+    if args.output:
+        bets.to_csv(args.output, index=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""Generate AI insights for a whole slate of props concurrently.
+
+Reads a CSV slate with player, stat and line columns. Builds the same
+prompt the player page builds, then sends the requests concurrently with
+an asyncio OpenAI client. A semaphore bounds how many are in flight.
+Rate-limited and transient failures are retried with exponential backoff,
+honouring Retry-After. Every response is written to the insight cache,
+so the page replays it instantly.
+
+    python -m nflstats.batch_insights slate.csv --season 2024 --concurrency 16
+    python -m nflstats.batch_insights slate.csv --base-url http://127.0.0.1:8000/v1
+
+The API key is read from OPENAI_API_KEY. --base-url points the client at
+a local stub chat-completions server for testing.
+"""
+import os
+import time
+import random
+import asyncio
+import argparse
+import logging
+
+import pandas as pd
+import openai
+from openai import AsyncOpenAI
+
+from nflstats import pipeline
+from nflstats.insight_cache import InsightCache
+from nflstats.insights import MODEL, TEMPERATURE, build_messages, player_insight_inputs
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+
+def _retry_delay(error, attempt, base_delay, max_delay):
+    # Prefer the server's Retry-After; otherwise back off exponentially with jitter
+    response = getattr(error, 'response', None)
+    retry_after = response.headers.get('retry-after') if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), max_delay)
+        except ValueError:
+            pass
+    return min(base_delay * 2 ** attempt, max_delay) * random.uniform(0.5, 1.0)
+
+
+async def generate_insight(client, semaphore, inputs, max_attempts=5, base_delay=1.0, max_delay=30.0):
+    """Non-streaming completion for one set of inputs, retried on transient errors."""
+    for attempt in range(max_attempts):
+        async with semaphore:
+            try:
+                completion = await client.chat.completions.create(
+                    model=MODEL,
+                    messages=build_messages(inputs),
+                    temperature=TEMPERATURE,
+                    n=1,
+                )
+                return completion.choices[0].message.content
+            except RETRYABLE_ERRORS as e:
+                if attempt == max_attempts - 1:
+                    raise
+                delay = _retry_delay(e, attempt, base_delay, max_delay)
+                logger.info("Retrying %s %s in %.1fs: %s", inputs['player'], inputs['stat'], delay, e)
+        # Sleep outside the semaphore so a backing-off request does not hold a slot
+        await asyncio.sleep(delay)
+
+
+async def run_slate(slate, inputs_list, cache, concurrency=16, base_url=None, api_key=None, timeout=60):
+    """Generate insights for every slate row with inputs; returns one result dict per row."""
+    client = AsyncOpenAI(api_key=api_key, base_url=base_url, timeout=timeout, max_retries=0)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(row, inputs):
+        result = {'player': row.player, 'stat': row.stat, 'line': row.line, 'cached': False, 'error': None}
+        if inputs is None:
+            result['error'] = 'no games for player/stat in season'
+            return result
+        cached_response = cache.get(inputs)
+        if cached_response is not None:
+            return {**result, 'cached': True, 'response': cached_response}
+        try:
+            response = await generate_insight(client, semaphore, inputs)
+        except Exception as e:
+            return {**result, 'error': str(e)}
+        cache.put(inputs, response)
+        return {**result, 'response': response}
+
+    try:
+        return await asyncio.gather(*(
+            run_one(row, inputs) for row, inputs in zip(slate.itertuples(index=False), inputs_list)
+        ))
+    finally:
+        await client.close()
+
+
+def slate_inputs(slate, season):
+    """Insight inputs for every slate row, built from the season store."""
+    player_index, next_games, defense_table = pipeline.load_prop_tables()
+    return [
+        player_insight_inputs(player_index, next_games, defense_table, season, row.player, row.stat, row.line)
+        for row in slate.itertuples(index=False)
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('slate', help='CSV with player, stat and line columns')
+    parser.add_argument('--season', type=int, default=2024)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--base-url', default=None)
+    parser.add_argument('--output', default=None, help='Write results to this CSV')
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    slate = pd.read_csv(args.slate)
+    inputs_list = slate_inputs(slate, args.season)
+    started = time.perf_counter()
+    results = asyncio.run(run_slate(
+        slate, inputs_list, InsightCache(), args.concurrency, args.base_url, os.environ.get('OPENAI_API_KEY')
+    ))
+    elapsed = time.perf_counter() - started
+
+    results = pd.DataFrame(results)
+    failed = results['error'].notna().sum()
+    print(f"{len(results)} props in {elapsed:.1f}s: {results['cached'].sum()} cached, {failed} failed")
+    if args.output:
+        results.to_csv(args.output, index=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""Column manifests: which source columns each page feature actually reads.
+
+Loaders take the union of the manifests for the features a page shows,
+and the store reads only those columns from its Parquet partitions.
+"""
+
+BOX_SCORE_COLUMNS = [
+    'week', 'game_date', 'opponent_team', 'fantasy_points_ppr',
+    'passing_yards', 'passing_tds', 'interceptions',
+    'rushing_yards', 'rushing_tds',
+    'receiving_yards', 'receiving_tds', 'receptions', 'targets'
+]
+
+# Stat columns the fantasy scoring engine can weight
+SCORING_COLUMNS = [
+    'passing_yards', 'passing_tds', 'interceptions', 'passing_2pt_conversions',
+    'rushing_yards', 'rushing_tds', 'rushing_2pt_conversions',
+    'receptions', 'receiving_yards', 'receiving_tds', 'receiving_2pt_conversions',
+    'sack_fumbles_lost', 'rushing_fumbles_lost', 'receiving_fumbles_lost', 'special_teams_tds',
+]
+
+# Feature -> weekly stats columns it reads
+WEEKLY_COLUMNS = {
+    # Keys, player selection and the roster merge
+    'core': ['player_id', 'season', 'week', 'position', 'recent_team', 'opponent_team'],
+    # Metric cards, box score and chart
+    'player_page': BOX_SCORE_COLUMNS,
+    # Opponent defense context for the AI insight
+    'ai_insight': ['opponent_team', 'week', 'passing_yards', 'rushing_yards', 'receiving_yards'],
+    # League-specific fantasy points
+    'fantasy': SCORING_COLUMNS,
+}
+
+# Features shown by the player pages; only their columns are loaded
+PAGE_FEATURES = ('player_page', 'ai_insight', 'fantasy')
+
+# Feature -> roster columns it reads
+ROSTER_COLUMNS = {
+    'core': ['player_id', 'season', 'week', 'first_name', 'last_name', 'position', 'headshot_url', 'team'],
+}
+
+
+def manifest(features, table=WEEKLY_COLUMNS):
+    """Ordered union of the columns read by the given features, always including 'core'."""
+    columns = []
+    for feature in ('core', *features):
+        for col in table.get(feature, []):
+            if col not in columns:
+                columns.append(col)
+    return columns
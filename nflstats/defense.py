@@ -0,0 +1,77 @@
+"""Materialized team defense tables for the opponent analysis.
+
+Built with grouped, vectorized operations once per data refresh, so the
+AI insight path only does an indexed lookup.
+"""
+import pandas as pd
+
+from nflstats.schedule import MAX_WEEK
+
+YARD_COLUMNS = ['passing_yards', 'rushing_yards', 'receiving_yards']
+ALLOWED_COLUMNS = ['points_allowed'] + YARD_COLUMNS
+
+
+def build_defense_weeks(weekly_df, team_games):
+    """Points and yards allowed by each defense per week, with to-date averages.
+
+    Indexed by (season, team, week), where team is the defense. Each
+    allowed column gets an 'avg_<column>' mean over that defense's games up
+    to and including the week.
+    """
+    # Yards gained by every offense against a defense are yards that defense allowed
+    yards = (
+        weekly_df.groupby(['season', 'opponent_team', 'week'], observed=True)[YARD_COLUMNS]
+        .sum()
+        .reset_index()
+        .rename(columns={'opponent_team': 'team'})
+    )
+    yards['team'] = yards['team'].astype(str)
+    points = team_games.reset_index()[['season', 'team', 'week', 'points_allowed']]
+    points = points[points['points_allowed'].notna()]
+
+    weeks = points.merge(yards, on=['season', 'team', 'week'], how='outer')
+    weeks = weeks.sort_values(['season', 'team', 'week']).reset_index(drop=True)
+
+    # Running sum over running count skips weeks where a column is missing
+    grouped = weeks.groupby(['season', 'team'], sort=False)
+    for col in ALLOWED_COLUMNS:
+        to_date_sum = grouped[col].cumsum()
+        to_date_games = weeks[col].notna().groupby([weeks['season'], weeks['team']]).cumsum()
+        weeks[f'avg_{col}'] = (to_date_sum / to_date_games.where(to_date_games > 0)).astype('float32')
+    weeks['games'] = grouped.cumcount().add(1).astype('int8')
+    return weeks.set_index(['season', 'team', 'week'])
+
+
+def build_defense_to_date(defense_weeks):
+    """To-date averages for every (season, team, as_of_week), for O(1) lookups.
+
+    as_of_week runs from 0 to MAX_WEEK and carries the averages forward
+    through bye weeks and weeks not yet played.
+    """
+    weeks = defense_weeks.reset_index()
+    avg_columns = [f'avg_{col}' for col in ALLOWED_COLUMNS] + ['games']
+    teams = weeks[['season', 'team']].drop_duplicates()
+    grid = teams.merge(pd.DataFrame({'as_of_week': range(MAX_WEEK + 1)}), how='cross')
+    grid['as_of_week'] = grid['as_of_week'].astype(weeks['week'].dtype)
+
+    to_date = pd.merge_asof(
+        grid.sort_values('as_of_week'),
+        weeks[['season', 'team', 'week'] + avg_columns].sort_values('week'),
+        left_on='as_of_week',
+        right_on='week',
+        by=['season', 'team'],
+        direction='backward',
+    )
+    to_date = to_date.drop(columns=['week'])
+    to_date[avg_columns] = to_date[avg_columns].fillna(0)
+    return to_date.set_index(['season', 'team', 'as_of_week']).sort_index()
+
+
+def defense_to_date(to_date, season, team, as_of_week):
+    """Averages allowed by a defense through as_of_week, keyed by the allowed column name."""
+    key = (season, team, min(int(as_of_week), MAX_WEEK))
+    try:
+        row = to_date.loc[key]
+    except (KeyError, TypeError):
+        return {col: 0 for col in ALLOWED_COLUMNS}
+    return {col: float(row[f'avg_{col}']) for col in ALLOWED_COLUMNS}
@@ -0,0 +1,75 @@
+"""Build the enriched weekly frame: weekly stats joined with roster details."""
+import pandas as pd
+
+from nflstats.schema import apply_schema
+
+# Bump whenever the output of enrich_weekly changes so cached builds are discarded
+ENRICH_VERSION = 3
+
+name_column = 'full_name'
+
+# Roster columns joined onto each game, as of that game's week
+ROSTER_DETAILS = [name_column, 'position', 'headshot_url', 'team']
+
+
+def week_ordinal(season, week):
+    """Sortable (season, week) key, e.g. 2023 week 5 -> 202305."""
+    return season.astype('int32') * 100 + week.astype('int32')
+
+
+def prepare_roster(roster_df):
+    """Build the roster dimension from weekly rosters: one row per player and valid-from week.
+
+    Rows are kept at the first week of each season and wherever a player's
+    name, position, headshot or team changes, sorted by (player_id, valid_from).
+    """
+    roster_df = roster_df.copy()
+    roster_df['player_id'] = roster_df['player_id'].astype(str)
+
+    # Create 'full_name' by combining 'first_name' and 'last_name'
+    if 'first_name' not in roster_df.columns or 'last_name' not in roster_df.columns:
+        raise ValueError("First name and last name columns not found in roster_df.")
+    roster_df[name_column] = roster_df['first_name'].astype(str) + ' ' + roster_df['last_name'].astype(str)
+
+    roster_df['valid_from'] = week_ordinal(roster_df['season'], roster_df['week'])
+    roster_df = roster_df.sort_values(['player_id', 'valid_from'], kind='stable').reset_index(drop=True)
+    details = roster_df[['player_id', 'season'] + ROSTER_DETAILS].astype(str)
+    changed = (details != details.shift()).any(axis=1)
+    return roster_df[changed.to_numpy()].reset_index(drop=True)
+
+
+def enrich_weekly(df, roster_df):
+    """Join each game to the player's roster row as of that week.
+
+    merge_asof picks the latest roster row at or before the game's
+    (season, week), so traded players carry the team they played for. Games
+    before a player's first roster row take the earliest row instead.
+    """
+    # Join on plain strings; the compact schema turns player_id back into a categorical
+    df = df.assign(
+        player_id=df['player_id'].astype(str),
+        game_ordinal=week_ordinal(df['season'], df['week']),
+        row_order=range(len(df)),
+    ).sort_values('game_ordinal', kind='stable')
+    roster = roster_df[['player_id', 'valid_from'] + ROSTER_DETAILS].sort_values('valid_from', kind='stable')
+    # Columns the weekly data already has get the '_roster' suffix, as a plain merge would
+    roster = roster.rename(columns={col: f'{col}_roster' for col in ROSTER_DETAILS if col in df.columns})
+    details = [col for col in roster.columns if col not in ('player_id', 'valid_from')]
+
+    joined = pd.merge_asof(df, roster, left_on='game_ordinal', right_on='valid_from', by='player_id',
+                           direction='backward')
+    missing = joined[details[0]].isna().to_numpy()
+    if missing.any():
+        earliest = pd.merge_asof(df[missing], roster, left_on='game_ordinal', right_on='valid_from',
+                                 by='player_id', direction='forward')
+        joined.loc[missing, details] = earliest[details].to_numpy()
+    df = joined.sort_values('row_order').drop(columns=['game_ordinal', 'valid_from', 'row_order'])
+
+    # Prefer the roster position over the one reported in the weekly data
+    if 'position_roster' in df.columns:
+        df['position'] = df['position_roster'].astype(object).fillna(df['position'].astype(object))
+        df = df.drop(columns=['position_roster'])
+    elif 'position' not in df.columns:
+        raise ValueError("'position' column not found after merging.")
+
+    return apply_schema(df.reset_index(drop=True))
@@ -0,0 +1,118 @@
+"""Rolling per-player features for every (season, player, stat, week).
+
+Each row holds the features through and including that week: games
+played, last-N means, a recency EWM, the season-to-date mean and standard
+deviation. The running state behind them (sum, sum of squares, EWM
+numerator and denominator) is stored too. A new week is then computed from
+each player's previous row and the last few sums rather than the whole
+history. Both the full build and the weekly update go through the same
+grouped cumulative sums, with no loop over players or weeks.
+"""
+import numpy as np
+import pandas as pd
+
+from nflstats.hit_prob import HALF_LIFE
+from nflstats.insights import STAT_COLUMNS
+
+WINDOWS = (3, 5)
+KEYS = ['season', 'player', 'stat']
+STATE_COLUMNS = ['games', 'sum', 'sumsq', 'ewm_num', 'ewm_den']
+# Per-game decay of the EWM, matching OutcomeTable's recency weights
+DECAY = 0.5 ** (1 / HALF_LIFE)
+
+
+def long_outcomes(player_frame, name_column='full_name', stats=None):
+    """One row per (season, player, stat, week), sorted by week within each group."""
+    stats = stats or sorted(set(STAT_COLUMNS.values()))
+    frame = player_frame[['season', name_column, 'week']].copy()
+    frame[name_column] = frame[name_column].astype(str)
+    frame['total_tds'] = player_frame['rushing_tds'] + player_frame['receiving_tds']
+    for stat in stats:
+        if stat != 'total_tds':
+            frame[stat] = player_frame[stat]
+    long = frame.melt(id_vars=['season', name_column, 'week'], value_vars=stats,
+                      var_name='stat', value_name='value').dropna(subset=['value'])
+    long = long.rename(columns={name_column: 'player'})
+    long['season'] = long['season'].astype('int64')
+    long['week'] = long['week'].astype('int64')
+    long['value'] = long['value'].astype('float64')
+    return long.sort_values(KEYS + ['week'], kind='stable').reset_index(drop=True)
+
+
+def _accumulate(long, context=None):
+    """Features for the rows of long, continuing from each group's rows in context (earlier weeks)."""
+    if context is None or context.empty:
+        carry = pd.DataFrame(0.0, index=long.index, columns=STATE_COLUMNS)
+    else:
+        last = context.groupby(KEYS, sort=False)[STATE_COLUMNS].last().reset_index()
+        carry = long[KEYS].merge(last, on=KEYS, how='left')[STATE_COLUMNS].fillna(0.0)
+        carry.index = long.index
+
+    grouped = long.groupby(KEYS, sort=False)
+    value = long['value']
+    step = grouped.cumcount().to_numpy() + 1
+    rows = long[KEYS + ['week', 'value']].copy()
+    rows['games'] = carry['games'] + step
+    rows['sum'] = carry['sum'] + grouped['value'].cumsum()
+    rows['sumsq'] = carry['sumsq'] + (value ** 2).groupby([long[key] for key in KEYS], sort=False).cumsum()
+
+    # ewm_t = v_t + DECAY * ewm_(t-1), unrolled as DECAY^j * (carry + cumsum(v_i * DECAY^-i))
+    growth = DECAY ** -step
+    scaled = pd.DataFrame({'num': value * growth, 'den': growth}, index=long.index)
+    scaled = scaled.groupby([long[key] for key in KEYS], sort=False).cumsum()
+    rows['ewm_num'] = (carry['ewm_num'] + scaled['num']) / growth
+    rows['ewm_den'] = (carry['ewm_den'] + scaled['den']) / growth
+
+    # Last-N sums are differences of running sums N rows apart, reaching back into context
+    sums = rows[KEYS + ['sum']]
+    if context is not None and not context.empty:
+        sums = pd.concat([context[KEYS + ['sum']], sums])
+    for window in WINDOWS:
+        before = sums.groupby(KEYS, sort=False)['sum'].shift(window).fillna(0.0).iloc[-len(rows):].to_numpy()
+        rows[f'last_{window}'] = (rows['sum'] - before) / np.minimum(rows['games'], window)
+
+    rows['season_avg'] = rows['sum'] / rows['games']
+    variance = (rows['sumsq'] - rows['sum'] ** 2 / rows['games']) / (rows['games'] - 1)
+    rows['std'] = np.sqrt(variance.clip(lower=0)).where(rows['games'] > 1)
+    rows['ewm'] = rows['ewm_num'] / rows['ewm_den']
+    return rows
+
+
+def _finish(rows):
+    output = [f'last_{window}' for window in WINDOWS] + ['season_avg', 'std', 'ewm']
+    rows = rows.astype({col: 'float32' for col in output + ['value']}).astype({'games': 'int16'})
+    return rows.set_index(KEYS + ['week']).sort_index()
+
+
+def build_features(player_frame, name_column='full_name', stats=None):
+    """Features for every player and stat, indexed by (season, player, stat, week)."""
+    return _finish(_accumulate(long_outcomes(player_frame, name_column, stats)))
+
+
+def update_features(features, player_frame, season, week, name_column='full_name'):
+    """Return features with (season, week) recomputed from the previous rows plus that week's games."""
+    stats = sorted(features.index.get_level_values('stat').unique())
+    week_frame = player_frame[(player_frame['season'] == season) & (player_frame['week'] == week)]
+    new = long_outcomes(week_frame, name_column, stats)
+
+    existing = features.reset_index()
+    in_season = existing['season'] == season
+    # Only the last max(WINDOWS) earlier rows of each player are needed
+    context = existing[in_season & (existing['week'] < week)]
+    context = context[context.set_index(KEYS).index.isin(new.set_index(KEYS).index)]
+    context = context.groupby(KEYS, sort=False).tail(max(WINDOWS))
+
+    rows = _finish(_accumulate(new, context))
+    replaced = in_season.to_numpy() & (existing['week'] == week).to_numpy()
+    return pd.concat([features[~replaced], rows.astype(features.dtypes.to_dict())]).sort_index()
+
+
+def player_features(features, season, player, stat):
+    """The player's latest feature row for a stat in a season as a dict, or None."""
+    try:
+        rows = features.loc[(season, player, stat)]
+    except (KeyError, TypeError):
+        return None
+    if rows.empty:
+        return None
+    return {name: float(value) for name, value in rows.iloc[-1].items()}
@@ -0,0 +1,103 @@
+"""Empirical hit probabilities for any betting line with a binary search.
+
+OutcomeTable stores one sorted block of outcomes for every
+(season, player, stat). Each block carries recency-weighted cumulative
+weights, where each game's weight halves every half_life games back.
+P(over), the hit count and fair decimal odds for any line then cost one
+np.searchsorted, whether for one line in the UI or thousands in a batch.
+"""
+import numpy as np
+import pandas as pd
+
+from nflstats.insights import STAT_COLUMNS
+
+# Games back at which a game counts half as much as the most recent one
+HALF_LIFE = 4
+
+
+class OutcomeTable:
+
+    def __init__(self, player_frame, name_column='full_name', stats=None, half_life=HALF_LIFE):
+        self.half_life = half_life
+        stats = stats or sorted(set(STAT_COLUMNS.values()))
+        frame = player_frame[['season', name_column, 'week']].copy()
+        frame[name_column] = frame[name_column].astype(str)
+        frame['total_tds'] = player_frame['rushing_tds'] + player_frame['receiving_tds']
+        for stat in stats:
+            if stat != 'total_tds':
+                frame[stat] = player_frame[stat]
+
+        # Long layout: one row per (season, player, stat, game)
+        long = frame.melt(id_vars=['season', name_column, 'week'], value_vars=stats,
+                          var_name='stat', value_name='value').dropna(subset=['value'])
+        long = long.sort_values(['season', name_column, 'stat', 'week'], kind='stable')
+        grouped = long.groupby(['season', name_column, 'stat'], sort=False)
+        games_back = grouped.cumcount(ascending=False)
+        long['weight'] = 0.5 ** (games_back / half_life)
+
+        # Sort each block by value and accumulate normalized weights
+        long = long.sort_values(['season', name_column, 'stat', 'value'], kind='stable').reset_index(drop=True)
+        grouped = long.groupby(['season', name_column, 'stat'], sort=False)
+        long['cum_weight'] = grouped['weight'].cumsum() / grouped['weight'].transform('sum')
+
+        self.values = long['value'].to_numpy(dtype='float64')
+        self.cum_weights = long['cum_weight'].to_numpy(dtype='float64')
+        group_ids = grouped.ngroup().to_numpy()
+        starts = np.flatnonzero(np.r_[True, group_ids[1:] != group_ids[:-1]]) if len(long) else np.zeros(0, int)
+        stops = np.r_[starts[1:], len(long)]
+        keys = long.iloc[starts][['season', name_column, 'stat']].itertuples(index=False, name=None)
+        self.blocks = {(int(season), name, stat): (int(start), int(stop))
+                       for (season, name, stat), start, stop in zip(keys, starts, stops)}
+
+        self._starts = starts.astype('int64')
+        self._stops = stops.astype('int64')
+        self._block_ids = {key: i for i, key in enumerate(self.blocks)}
+
+        # Offsetting each block by its id makes the whole array globally sorted for batch queries
+        self._base = self.values.min() if len(long) else 0.0
+        self._span = (self.values.max() - self._base + 1) if len(long) else 1.0
+        block_of_row = np.repeat(np.arange(len(starts)), stops - starts)
+        self._composite = block_of_row * self._span + (self.values - self._base)
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes + self.cum_weights.nbytes + self._composite.nbytes
+
+    def _result(self, starts, stops, positions):
+        games = stops - starts
+        hits = stops - positions
+        below = positions - 1
+        weighted_under = np.where(below >= starts, self.cum_weights[np.maximum(below, 0)], 0.0) \
+            if len(self.cum_weights) else np.zeros_like(positions, dtype='float64')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            p_over = np.where(games > 0, hits / games, np.nan)
+            p_weighted = np.where(games > 0, 1.0 - weighted_under, np.nan)
+            fair_odds = 1.0 / p_weighted
+        return {'games': games, 'hits': hits, 'p_over': p_over,
+                'p_over_weighted': p_weighted, 'fair_odds': fair_odds}
+
+    def over(self, season, player, stat, lines):
+        """Hit counts, P(over) (plain and recency-weighted) and fair odds for one line or an array of lines."""
+        start, stop = self.blocks.get((int(season), player, stat), (0, 0))
+        lines = np.asarray(lines, dtype='float64')
+        positions = start + np.searchsorted(self.values[start:stop], lines, side='right')
+        return self._result(np.full_like(positions, start), np.full_like(positions, stop), positions)
+
+    def over_many(self, queries):
+        """over() for a frame of (season, player, stat, line) queries with a single searchsorted."""
+        keys = zip(queries['season'].astype(int), queries['player'], queries['stat'])
+        block_ids = np.array([self._block_ids.get(key, -1) for key in keys], dtype='int64')
+        known = block_ids >= 0
+        safe_ids = np.maximum(block_ids, 0)
+        lines = queries['line'].to_numpy(dtype='float64')
+
+        # Clip lines into each block's range so a search never lands in a neighbouring block
+        offsets = np.clip(lines - self._base, -0.5, self._span - 0.5)
+        positions = np.searchsorted(self._composite, safe_ids * self._span + offsets, side='right')
+        if len(self._starts):
+            starts = np.where(known, self._starts[safe_ids], 0)
+            stops = np.where(known, self._stops[safe_ids], 0)
+        else:
+            starts = stops = np.zeros(len(queries), dtype='int64')
+        positions = np.where(known, positions, 0)
+        return pd.DataFrame(self._result(starts, stops, positions), index=queries.index)
@@ -0,0 +1,31 @@
+"""Detect when a refreshed frame only appends weeks to an earlier version.
+
+Tables derived from the weekly frame (the matchup cube, the player
+features) can then be updated one week at a time instead of rebuilt.
+week_digests summarizes each (season, week) by its row count and an
+order-independent sum of row hashes. Comparing the digests of two versions
+shows which weeks are new and whether any earlier week changed.
+"""
+import pandas as pd
+
+
+def week_digests(frame):
+    """Row count and hash sum per (season, week), indexed by (season, week)."""
+    hashes = pd.util.hash_pandas_object(frame, index=False).to_numpy()
+    keys = frame[['season', 'week']].astype('int64').assign(hash=hashes)
+    return keys.groupby(['season', 'week']).agg(rows=('hash', 'size'), hash=('hash', 'sum'))
+
+
+def appended_weeks(old, new):
+    """(season, week) pairs new adds after the last week of each season in old, in order.
+
+    None when any week of old changed or went missing, or a new week falls
+    before a season's last old week, since only a full rebuild is correct then.
+    """
+    if not old.index.isin(new.index).all() or not new.loc[old.index].equals(old):
+        return None
+    last_weeks = old.reset_index().groupby('season')['week'].max()
+    added = new.index.difference(old.index)
+    if any(week <= last_weeks.get(season, 0) for season, week in added):
+        return None
+    return [(int(season), int(week)) for season, week in added.sort_values()]
@@ -0,0 +1,119 @@
+"""Persistent cache of AI insight responses keyed on the prompt inputs.
+
+Entries are keyed by a hash of the structured inputs (see
+insights.insight_inputs) together with the model and prompt version. They
+expire after a TTL and the least recently used entries are evicted beyond
+max_entries. Hit and miss counts are kept in the same SQLite file, so
+the hit rate covers every worker process. Each thread gets its own
+connection to the file.
+"""
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+from nflstats import insights, store
+
+DB_PATH = store.DATA_DIR / 'insight_cache.sqlite'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS insights (
+    key TEXT PRIMARY KEY,
+    inputs TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS insights_last_used ON insights (last_used);
+CREATE TABLE IF NOT EXISTS insight_stats (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def insight_key(inputs):
+    payload = {'model': insights.MODEL, 'prompt_version': insights.PROMPT_VERSION, 'inputs': inputs}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def replay_stream(text, chunk_words=3, delay=0.02):
+    """Yield a cached response a few words at a time so it renders like a live stream."""
+    words = text.split(' ')
+    for start in range(0, len(words), chunk_words):
+        yield ' '.join(words[start:start + chunk_words]) + (' ' if start + chunk_words < len(words) else '')
+        if delay:
+            time.sleep(delay)
+
+
+class InsightCache:
+
+    def __init__(self, path=DB_PATH, ttl_seconds=6 * 3600, max_entries=5000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.path = path
+        self._local = threading.local()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Create the schema up front
+        self.conn
+
+    @property
+    def conn(self):
+        """The calling thread's connection; one connection is never shared between session threads."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name):
+        self.conn.execute(
+            'INSERT INTO insight_stats (name, value) VALUES (?, 1) '
+            'ON CONFLICT (name) DO UPDATE SET value = value + 1',
+            (name,),
+        )
+
+    def get(self, inputs):
+        """The cached response for these inputs, or None on a miss or an expired entry."""
+        key = insight_key(inputs)
+        now = time.time()
+        with self.conn:
+            row = self.conn.execute('SELECT response, created_at FROM insights WHERE key = ?', (key,)).fetchone()
+            if row is not None and now - row[1] > self.ttl_seconds:
+                self.conn.execute('DELETE FROM insights WHERE key = ?', (key,))
+                row = None
+            if row is None:
+                self._count('misses')
+                return None
+            self.conn.execute('UPDATE insights SET last_used = ?, hits = hits + 1 WHERE key = ?', (now, key))
+            self._count('hits')
+        return row[0]
+
+    def put(self, inputs, response):
+        now = time.time()
+        with self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO insights (key, inputs, response, created_at, last_used) VALUES (?, ?, ?, ?, ?)',
+                (insight_key(inputs), json.dumps(inputs, sort_keys=True), response, now, now),
+            )
+            # Evict the least recently used entries beyond the cap
+            self.conn.execute(
+                'DELETE FROM insights WHERE key IN ('
+                '  SELECT key FROM insights ORDER BY last_used DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,),
+            )
+
+    def stats(self):
+        counts = dict(self.conn.execute('SELECT name, value FROM insight_stats').fetchall())
+        hits, misses = counts.get('hits', 0), counts.get('misses', 0)
+        entries = self.conn.execute('SELECT COUNT(*) FROM insights').fetchone()[0]
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+            'entries': entries,
+        }
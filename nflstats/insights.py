@@ -0,0 +1,151 @@
+"""Structured inputs and prompt for the AI betting-line insight.
+
+The page, the batch generator and the response cache all build the
+prompt from the same inputs dict, so identical analyses share one cache
+key.
+"""
+from nflstats.defense import defense_to_date
+from nflstats.schedule import next_game
+
+MODEL = 'gpt-4o'
+TEMPERATURE = 0.7
+SYSTEM_MESSAGE = 'you are a helpful assistant'
+
+# Display stat -> weekly stats column, as the player page maps them
+STAT_COLUMNS = {
+    'Passing Yards': 'passing_yards',
+    'Passing TDs': 'passing_tds',
+    'Rushing Yards': 'rushing_yards',
+    'Rushing TDs': 'rushing_tds',
+    'Receiving Yards': 'receiving_yards',
+    'Receptions': 'receptions',
+    'Total TDs': 'total_tds',
+}
+
+# Bump whenever PROMPT_TEMPLATE changes so cached responses to the old prompt are not reused
+PROMPT_VERSION = 1
+
+PROMPT_TEMPLATE = """
+You are a sports analyst.
+
+Provide a concise analysis on the likelihood of {player} ({position}, {team}) exceeding {line} {stat} in the upcoming game against {opponent}.
+
+Consider the following statistics:
+
+- **Average {stat} over the last 3 games**: {recent_avg}
+- **Season average {stat}**: {season_avg}
+- **Percentage of games over {line} {stat}**: {pct_over}%
+- **Total games played this season**: {total_games}
+
+Opponent's defensive stats:
+
+- {opponent} allows an average of:
+- **Passing yards allowed per game**: {passing_yards_allowed}
+- **Rushing yards allowed per game**: {rushing_yards_allowed}
+- **Receiving yards allowed per game**: {receiving_yards_allowed}
+- **Points allowed per game**: {points_allowed}
+
+Do not mention previous injuries or factors not included in the data.
+
+Conclude with a clear and concise recommendation on whether it is likely or unlikely that {player} will exceed the betting line, supported by the data provided. Bold the key statistics in your response.
+"""
+
+
+def _round(value):
+    return None if value is None else round(float(value), 1)
+
+
+def insight_inputs(player, position, team, stat, line, season, week, opponent,
+                   recent_avg, season_avg, pct_over, total_games, allowed=None):
+    """Everything the prompt depends on, rounded to the precision shown in the prompt.
+
+    allowed is the opponent's to-date averages from defense.defense_to_date,
+    or None when the next opponent is unknown.
+    """
+    allowed = allowed or {}
+    return {
+        'player': player,
+        'position': position,
+        'team': team,
+        'stat': stat,
+        'line': float(line),
+        'season': int(season),
+        'week': None if week is None else int(week),
+        'opponent': opponent or 'Unknown',
+        'recent_avg': _round(recent_avg),
+        'season_avg': _round(season_avg),
+        'pct_over': _round(pct_over),
+        'total_games': int(total_games),
+        'points_allowed': _round(allowed.get('points_allowed')),
+        'passing_yards_allowed': _round(allowed.get('passing_yards')),
+        'rushing_yards_allowed': _round(allowed.get('rushing_yards')),
+        'receiving_yards_allowed': _round(allowed.get('receiving_yards')),
+    }
+
+
+def build_prompt(inputs):
+    values = {key: 'N/A' if value is None else value for key, value in inputs.items()}
+    return PROMPT_TEMPLATE.format(**values)
+
+
+def build_messages(inputs):
+    return [
+        {'role': 'system', 'content': SYSTEM_MESSAGE},
+        {'role': 'user', 'content': build_prompt(inputs)},
+    ]
+
+
+def player_insight_inputs(player_index, next_games, defense_table, season, player, stat, line):
+    """Compute the page's insight inputs for one (player, stat, line) from the shared tables.
+
+    Returns None when the player has no games in the season or the stat is unknown.
+    """
+    player_data = player_index.rows(season, player)
+    column = STAT_COLUMNS.get(stat)
+    if player_data.empty or column is None:
+        return None
+    if column == 'total_tds':
+        values = player_data['rushing_tds'] + player_data['receiving_tds']
+    else:
+        values = player_data[column]
+
+    info = player_index.info(player, season)
+    team = info.get('team', 'N/A')
+    last_week_played = int(player_data['week'].max())
+    upcoming_game = next_game(next_games, season, team, last_week_played)
+    if upcoming_game is not None:
+        week, opponent = int(upcoming_game['week']), upcoming_game['opponent']
+        allowed = defense_to_date(defense_table, season, opponent, last_week_played)
+    else:
+        week, opponent, allowed = None, None, None
+
+    total_games = len(values)
+    return insight_inputs(
+        player, str(info.get('position', 'N/A')).upper(), team, stat, line, season, week, opponent,
+        values.tail(3).mean(), values.mean(), (values > float(line)).mean() * 100, total_games, allowed,
+    )
+
+
+def template_summary(inputs):
+    """A local, template-based insight from the same statistics, used when the LLM is unavailable."""
+    line, stat, player = inputs['line'], inputs['stat'], inputs['player']
+    recent, season, pct_over = inputs['recent_avg'], inputs['season_avg'], inputs['pct_over']
+    signals = [
+        pct_over is not None and pct_over > 50,
+        recent is not None and recent > line,
+        season is not None and season > line,
+    ]
+    verdict = 'likely' if sum(signals) >= 2 else 'unlikely'
+
+    lines = [
+        f"{player} has averaged **{recent}** {stat} over the last 3 games and **{season}** for the season, "
+        f"going over {line} in **{pct_over}%** of **{inputs['total_games']}** games.",
+    ]
+    if inputs['opponent'] != 'Unknown' and inputs['points_allowed'] is not None:
+        lines.append(
+            f"{inputs['opponent']} allows **{inputs['passing_yards_allowed']}** passing, "
+            f"**{inputs['rushing_yards_allowed']}** rushing and **{inputs['receiving_yards_allowed']}** "
+            f"receiving yards and **{inputs['points_allowed']}** points per game."
+        )
+    lines.append(f"Based on these numbers it is **{verdict}** that {player} exceeds {line} {stat}.")
+    return '\n\n'.join(lines)
@@ -0,0 +1,108 @@
+"""Presorted leaderboards and percentile ranks.
+
+For every (season, through week, position, stat, window) the table holds
+one block of players, sorted by their total over the window. The windows
+are that week alone, the last 4 weeks and the season to date. A top-k
+query is a dict lookup plus a slice of the block, and percentile ranks are
+precomputed per block, so nothing is sorted at request time.
+"""
+import numpy as np
+import pandas as pd
+
+from nflstats.features import long_outcomes
+from nflstats.insights import STAT_COLUMNS
+
+# Window label -> number of weeks, 0 meaning the season to date
+WINDOWS = {'Week': 1, 'Last 4 weeks': 4, 'Season': 0}
+LEADERBOARD_STATS = sorted(set(STAT_COLUMNS.values()) | {'targets', 'fantasy_points_ppr'})
+BLOCK = ['season', 'week', 'position', 'stat', 'window']
+
+
+def ordinal(number):
+    """1 -> '1st', 2 -> '2nd', 13 -> '13th', 22 -> '22nd'."""
+    number = int(number)
+    suffix = 'th' if 10 <= number % 100 <= 20 else {1: 'st', 2: 'nd', 3: 'rd'}.get(number % 10, 'th')
+    return f'{number}{suffix}'
+
+
+class Leaderboard:
+
+    def __init__(self, player_frame, name_column='full_name', stats=None):
+        stats = [stat for stat in (stats or LEADERBOARD_STATS)
+                 if stat == 'total_tds' or stat in player_frame.columns]
+        long = long_outcomes(player_frame, name_column, stats)
+
+        # Dense (season, player, stat, week) grid of season-to-date totals, so windows are row shifts
+        running = long.assign(
+            total=long.groupby(['season', 'player', 'stat'], sort=False)['value'].cumsum(),
+            played=long.groupby(['season', 'player', 'stat'], sort=False).cumcount() + 1,
+        )
+        weeks = long.groupby('season')['week'].max()
+        grid = running[['season', 'player', 'stat']].drop_duplicates()
+        grid = grid.merge(pd.DataFrame({'week': range(1, int(weeks.max()) + 1 if len(weeks) else 1)}), how='cross')
+        grid = grid[grid['week'] <= grid['season'].map(weeks)]
+        grid = pd.merge_asof(
+            grid.sort_values('week'), running[['season', 'player', 'stat', 'week', 'total', 'played']].sort_values('week'),
+            on='week', by=['season', 'player', 'stat'], direction='backward',
+        ).fillna({'total': 0.0, 'played': 0})
+        grid = grid.sort_values(['season', 'player', 'stat', 'week'], kind='stable').reset_index(drop=True)
+
+        # Each player is ranked at the position they last played in the season
+        positions = player_frame[['season', name_column, 'position']].dropna()
+        positions = positions.assign(player=positions[name_column].astype(str), position=positions['position'].astype(str))
+        positions = positions.groupby(['season', 'player'], observed=True)['position'].last()
+        grid = grid.join(positions, on=['season', 'player'])
+
+        grouped = grid.groupby(['season', 'player', 'stat'], sort=False)
+        frames = []
+        for label, window in WINDOWS.items():
+            if window:
+                before = grouped[['total', 'played']].shift(window).fillna(0)
+                part = grid.assign(total=grid['total'] - before['total'], games=grid['played'] - before['played'])
+            else:
+                part = grid.assign(games=grid['played'])
+            frames.append(part[part['games'] > 0].assign(window=label))
+        table = pd.concat(frames, ignore_index=True).drop(columns=['played'])
+        table['per_game'] = table['total'] / table['games']
+
+        table = table.sort_values(BLOCK + ['total'], ascending=[True] * len(BLOCK) + [False], kind='stable')
+        table = table.reset_index(drop=True)
+        blocks = table.groupby(BLOCK, sort=False, observed=True)
+        # Share of the block at or below each player's total, as 0-100
+        table['percentile'] = (blocks['total'].rank(method='max', pct=True) * 100).astype('float32')
+        table['rank'] = blocks.cumcount().astype('int32') + 1
+        self.table = table.astype({
+            'player': 'category', 'position': 'category', 'stat': 'category', 'window': 'category',
+            'total': 'float32', 'per_game': 'float32', 'games': 'int16',
+            'season': 'int16', 'week': 'int8',
+        })
+
+        block_ids = blocks.ngroup().to_numpy()
+        starts = np.flatnonzero(np.r_[True, block_ids[1:] != block_ids[:-1]]) if len(table) else np.zeros(0, int)
+        stops = np.r_[starts[1:], len(table)]
+        keys = table.iloc[starts][BLOCK].itertuples(index=False, name=None)
+        self.blocks = {
+            (int(season), int(week), position, stat, window): (int(start), int(stop))
+            for (season, week, position, stat, window), start, stop in zip(keys, starts, stops)
+        }
+        self.last_weeks = {int(season): int(week) for season, week in weeks.items()}
+        self.positions = {(int(season), player): position for (season, player), position in positions.items()}
+
+    @property
+    def nbytes(self):
+        return int(self.table.memory_usage(deep=True).sum())
+
+    def top(self, season, week, position, stat, window='Season', k=25):
+        """The top k players by total, already sorted, with rank and percentile."""
+        start, stop = self.blocks.get((int(season), int(week), position, stat, window), (0, 0))
+        return self.table.iloc[start:min(stop, start + k)]
+
+    def percentile(self, season, week, player, stat, window='Season'):
+        """A player's row (rank, total, percentile) within their position as a dict, or None."""
+        position = self.positions.get((int(season), player))
+        start, stop = self.blocks.get((int(season), int(week), position, stat, window), (0, 0))
+        # Blocks hold one position's players, so a scan of the block is cheap
+        matches = np.flatnonzero(self.table['player'].iloc[start:stop].to_numpy() == player)
+        if not len(matches):
+            return None
+        return self.table.iloc[start + int(matches[0])].to_dict()
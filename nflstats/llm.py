@@ -0,0 +1,129 @@
+"""Bounded-latency streaming for the AI insight call.
+
+InsightClient holds one pooled OpenAI client per process. It enforces a
+first-token deadline through the HTTP read timeout and a total deadline
+while streaming. A circuit breaker opens after repeated failures. While
+the breaker is open, and whenever a call fails or misses a deadline, the
+insight falls back to insights.template_summary, so a slow or failing
+upstream never leaves the page waiting.
+"""
+import time
+import logging
+import threading
+
+from openai import OpenAI, Timeout
+
+from nflstats.insights import MODEL, TEMPERATURE, build_messages, template_summary
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """Opens after failure_threshold consecutive failures; lets one trial call through after reset_seconds."""
+
+    def __init__(self, failure_threshold=3, reset_seconds=60):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return 'half_open'
+        return 'open'
+
+    def allow(self):
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half_open' and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def release(self):
+        """End a trial call that neither succeeded nor failed, so the next one can go through."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.failures >= self.failure_threshold or self.opened_at is not None:
+                self.opened_at = time.monotonic()
+
+
+class InsightClient:
+
+    def __init__(self, api_key, first_token_seconds=8, total_seconds=30, breaker=None, **client_kwargs):
+        self.total_seconds = total_seconds
+        self.breaker = breaker or CircuitBreaker()
+        # The read timeout bounds the wait for the first token and for every chunk after it
+        self.client = OpenAI(
+            api_key=api_key,
+            timeout=Timeout(total_seconds, connect=5.0, read=first_token_seconds),
+            max_retries=0,
+            **client_kwargs,
+        )
+
+    def _stream_llm(self, inputs):
+        started = time.monotonic()
+        stream = self.client.chat.completions.create(
+            model=MODEL,
+            messages=build_messages(inputs),
+            temperature=TEMPERATURE,
+            n=1,
+            stop=None,
+            stream=True,
+        )
+        try:
+            for chunk in stream:
+                if time.monotonic() - started > self.total_seconds:
+                    raise DeadlineExceeded(f"insight took longer than {self.total_seconds}s")
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            stream.close()
+
+    def stream(self, inputs, status):
+        """Yield the insight text. status['source'] ends up as 'llm' or 'fallback'."""
+        status['source'] = 'fallback'
+        if not self.breaker.allow():
+            yield template_summary(inputs)
+            return
+
+        streamed_any = False
+        try:
+            for text in self._stream_llm(inputs):
+                streamed_any = True
+                yield text
+        except Exception as e:
+            logger.warning("Insight call failed, using the template summary: %s", e)
+            self.breaker.record_failure()
+            # Keep what was already shown and finish with the local summary
+            yield ('\n\n---\n\n' if streamed_any else '') + template_summary(inputs)
+            return
+        except BaseException:
+            # Closed mid-stream (GeneratorExit) or interrupted: not an upstream failure,
+            # but a half-open trial must not stay in flight forever
+            self.breaker.release()
+            raise
+        self.breaker.record_success()
+        status['source'] = 'llm'
@@ -0,0 +1,234 @@
+"""Streamlit-cached data loaders shared by the NFL pages.
+
+Each frame is looked up in the per-process shared cache, then in the Arrow
+snapshots shared by all workers, and only built from the season store
+when neither has the current version.
+"""
+import os
+
+import streamlit as st
+
+from nflstats import columns, defense, enrich, features, incremental, matchups, odds_history, schedule, snapshot, store, usage
+from nflstats.hit_prob import OutcomeTable
+from nflstats.insight_cache import InsightCache
+from nflstats.leaderboards import Leaderboard
+from nflstats.llm import InsightClient
+from nflstats.player_index import PlayerIndex, sorted_player_frame
+from nflstats.scoring import PRESETS, ScoringEngine, rule_set_hash
+from nflstats.shared import SharedFrameCache
+
+ROSTER_SEASONS = store.ROSTER_SEASONS
+PAGE_FEATURES = columns.PAGE_FEATURES
+
+# Memory cap for frames shared across sessions in this process
+FRAME_CACHE_MB = int(os.environ.get('NFL_FRAME_CACHE_MB', 1024))
+
+
+@st.cache_resource
+def get_frame_cache():
+    return SharedFrameCache(FRAME_CACHE_MB * 1024 ** 2)
+
+
+def _shared(name, token, build):
+    return get_frame_cache().get(name, token, lambda: snapshot.load(name, token, build))
+
+
+def _appended(name, token, frame, build, update):
+    """Like _shared, but when frame only appends weeks to the frame behind the cached value,
+    update(value, season, week) is applied for each new week instead of a full build."""
+    cache = get_frame_cache()
+    previous, previous_weeks = cache.peek(name), cache.peek(f'{name}_weeks')
+    weeks = cache.get(f'{name}_weeks', token, lambda: incremental.week_digests(frame))
+
+    def build_or_update():
+        if previous is None or previous_weeks is None or previous[0] != previous_weeks[0]:
+            return build()
+        appended = incremental.appended_weeks(previous_weeks[1], weeks)
+        if appended is None:
+            return build()
+        value = previous[1]
+        for season, week in appended:
+            value = update(value, season, week)
+        return value
+
+    return _shared(name, token, build_or_update)
+
+
+def get_odds_history():
+    """Return this thread's connection to the odds snapshot store; connections are never shared."""
+    return odds_history.thread_connection()
+
+
+@st.cache_resource
+def get_insight_cache():
+    return InsightCache()
+
+
+@st.cache_resource
+def get_insight_client():
+    # One pooled client and circuit breaker per process instead of a new client per click
+    return InsightClient(st.secrets.OPENAI_API_KEY)
+
+
+def get_player_stats(features=PAGE_FEATURES):
+    return store.read('weekly', store.SEASONS, columns.manifest(features))
+
+
+def get_roster_data():
+    return store.read('weekly_rosters', ROSTER_SEASONS, columns.manifest((), columns.ROSTER_COLUMNS))
+
+
+def get_schedule_data(seasons=tuple(store.SEASONS)):
+    """Return the shared schedule frame, preloaded for every season in the stats range."""
+    seasons = list(seasons)
+    token = (store.refresh('schedules', seasons),)
+    name = 'schedule_' + '_'.join(str(season) for season in seasons)
+    return _shared(name, token, lambda: store.read('schedules', seasons))
+
+
+def get_team_games():
+    """Return the shared one-row-per-team-game table, indexed by (season, team, week)."""
+    token = (store.refresh('schedules', store.SEASONS),)
+    return _shared('team_games', token, lambda: schedule.build_team_games(get_schedule_data()))
+
+
+def get_next_games():
+    """Return the shared next-game table, indexed by (season, team, after_week)."""
+    token = (store.refresh('schedules', store.SEASONS),)
+    return _shared('next_games', token, lambda: schedule.build_next_games(get_team_games()))
+
+
+def _roster_token():
+    return (
+        enrich.ENRICH_VERSION,
+        store.refresh('weekly_rosters', ROSTER_SEASONS),
+        tuple(columns.manifest((), columns.ROSTER_COLUMNS)),
+    )
+
+
+def _weekly_token(features):
+    return (
+        _roster_token(),
+        store.refresh('weekly', store.SEASONS),
+        tuple(columns.manifest(features)),
+    )
+
+
+def get_data_token(features=PAGE_FEATURES):
+    """Return the version token of the enriched weekly data, for keying page-level st.cache_data calls."""
+    return _weekly_token(features)
+
+
+def get_roster_frame():
+    return _shared('roster', _roster_token(), lambda: enrich.prepare_roster(get_roster_data()))
+
+
+def get_weekly_frame(features=PAGE_FEATURES):
+    """Return the shared enriched weekly frame holding the columns the features read."""
+    roster_df = get_roster_frame()
+    name = 'weekly_' + '_'.join(features)
+    return _shared(name, _weekly_token(features),
+                   lambda: enrich.enrich_weekly(get_player_stats(features), roster_df))
+
+
+def get_enriched_data(features=PAGE_FEATURES):
+    """Return the shared (enriched weekly frame, roster frame) pair. Do not modify in place."""
+    return get_weekly_frame(features), get_roster_frame()
+
+
+def get_player_index(features=PAGE_FEATURES):
+    """Return the shared PlayerIndex over the enriched weekly frame."""
+    df, roster_df = get_enriched_data(features)
+    name = '_'.join(features)
+    token = _weekly_token(features)
+    # The sorted frame is snapshotted and mapped by every worker; only the slice dicts are per process
+    frame = _shared(f'player_frame_{name}', token, lambda: sorted_player_frame(df, enrich.name_column))
+    return get_frame_cache().get(f'player_index_{name}', token,
+                                 lambda: PlayerIndex(frame, roster_df, enrich.name_column, presorted=True))
+
+
+def get_defense_weeks():
+    """Return the shared per-week defense table, indexed by (season, team, week)."""
+    weekly_df = get_weekly_frame()
+    team_games = get_team_games()
+    token = (_weekly_token(PAGE_FEATURES), store.fingerprint('schedules', store.SEASONS))
+    return _shared('defense_weeks', token, lambda: defense.build_defense_weeks(weekly_df, team_games))
+
+
+def get_defense_to_date():
+    """Return the shared to-date defense table, indexed by (season, team, as_of_week)."""
+    defense_weeks = get_defense_weeks()
+    token = (_weekly_token(PAGE_FEATURES), store.fingerprint('schedules', store.SEASONS))
+    return _shared('defense_to_date', token, lambda: defense.build_defense_to_date(defense_weeks))
+
+
+def get_matchup_cube():
+    """Return the shared defense-vs-position cube, indexed by (season, week, defense, position)."""
+    weekly_df = get_weekly_frame()
+    return _appended('matchup_cube', _weekly_token(PAGE_FEATURES), weekly_df,
+                     lambda: matchups.build_matchup_cube(weekly_df),
+                     lambda cube, season, week: matchups.update_matchup_cube(cube, weekly_df, season, week))
+
+
+def get_scoring_engine():
+    """Return the shared ScoringEngine over the player index frame."""
+    player_index = get_player_index()
+    return get_frame_cache().get('scoring_engine', _weekly_token(PAGE_FEATURES),
+                                 lambda: ScoringEngine(player_index.frame))
+
+
+def get_fantasy_points(preset):
+    """Return the shared fantasy points of every player-week under a scoring preset."""
+    engine = get_scoring_engine()
+    return get_frame_cache().get(f'fantasy_points_{preset}', _weekly_token(PAGE_FEATURES),
+                                 lambda: engine.points(PRESETS[preset]))
+
+
+def get_fantasy_outcome_table(preset):
+    """Return a shared OutcomeTable of fantasy points under a scoring preset."""
+    player_index = get_player_index()
+    points = get_fantasy_points(preset)
+    frame = player_index.frame[['season', enrich.name_column, 'week', 'rushing_tds', 'receiving_tds']]
+    return get_frame_cache().get(f'outcome_table_fantasy_{preset}', _weekly_token(PAGE_FEATURES), lambda: OutcomeTable(
+        frame.assign(fantasy_points=points), enrich.name_column, stats=['fantasy_points']
+    ))
+
+
+def get_leaderboard():
+    """Return the shared presorted Leaderboard over the stat columns."""
+    player_index = get_player_index()
+    return get_frame_cache().get('leaderboard', _weekly_token(PAGE_FEATURES),
+                                 lambda: Leaderboard(player_index.frame, enrich.name_column))
+
+
+def get_fantasy_leaderboard(rules):
+    """Return a shared Leaderboard of fantasy points under one scoring rule set."""
+    player_index = get_player_index()
+    engine = get_scoring_engine()
+    name = 'leaderboard_fantasy_' + rule_set_hash(rules)[:16]
+    return get_frame_cache().get(name, _weekly_token(PAGE_FEATURES), lambda: Leaderboard(
+        player_index.frame.assign(fantasy_points=engine.points(rules)), enrich.name_column, ['fantasy_points']
+    ))
+
+
+def get_usage_frame():
+    """Return the shared play-by-play usage table, indexed by (season, player_id)."""
+    token = (usage.USAGE_VERSION, store.refresh('usage', store.SEASONS))
+    return _shared('usage', token, lambda: usage.usage_index(store.read('usage', store.SEASONS)))
+
+
+def get_player_features():
+    """Return the shared rolling feature table, indexed by (season, player, stat, week)."""
+    player_index = get_player_index()
+    frame = player_index.frame
+    return _appended('player_features', _weekly_token(PAGE_FEATURES), frame,
+                     lambda: features.build_features(frame, enrich.name_column),
+                     lambda table, season, week: features.update_features(
+                         table, frame, season, week, enrich.name_column))
+
+
+def get_outcome_table():
+    """Return the shared OutcomeTable of sorted per-(season, player, stat) outcomes."""
+    player_index = get_player_index()
+    return get_frame_cache().get('outcome_table', _weekly_token(PAGE_FEATURES),
+                                 lambda: OutcomeTable(player_index.frame, enrich.name_column))
@@ -0,0 +1,137 @@
+"""Defense-vs-position matchup cube.
+
+For every (season, week, defense, position) the cube holds each stat's
+total allowed to date, the per-game average and the league rank of that
+average (1 = allows the most). build_matchup_cube computes all weeks in
+one grouped pass. update_matchup_cube appends a single new week from the
+previous week's running totals.
+"""
+import numpy as np
+import pandas as pd
+
+MATCHUP_STATS = [
+    'passing_yards', 'passing_tds', 'rushing_yards', 'rushing_tds',
+    'receiving_yards', 'receiving_tds', 'receptions', 'targets',
+    'total_tds', 'fantasy_points_ppr',
+]
+
+INDEX = ['season', 'week', 'defense', 'position']
+
+
+def _weekly_allowed(weekly_df):
+    """Stats allowed per (season, week, defense, position) and the weeks each defense played."""
+    weekly = weekly_df[weekly_df['position'].notna() & weekly_df['opponent_team'].notna()]
+    weekly = weekly.assign(
+        defense=weekly['opponent_team'].astype(str),
+        position=weekly['position'].astype(str),
+        total_tds=weekly['rushing_tds'] + weekly['receiving_tds'],
+    )
+    stats = [stat for stat in MATCHUP_STATS if stat in weekly.columns]
+    allowed = weekly.groupby(INDEX, observed=True)[stats].sum()
+    played = weekly[['season', 'week', 'defense']].drop_duplicates()
+    return allowed, played
+
+
+def _finish(cube, stats):
+    # Per-game averages and league ranks within each (season, week, position)
+    games = cube['games'].where(cube['games'] > 0)
+    for stat in stats:
+        cube[f'{stat}_avg'] = (cube[f'{stat}_total'] / games).astype('float32')
+    ranks = cube.groupby(['season', 'week', 'position'])[[f'{stat}_avg' for stat in stats]].rank(
+        ascending=False, method='min'
+    )
+    for stat in stats:
+        cube[f'{stat}_rank'] = ranks[f'{stat}_avg'].astype('float32')
+    return cube
+
+
+def build_matchup_cube(weekly_df):
+    """Build the whole cube, indexed by (season, week, defense, position)."""
+    allowed, played = _weekly_allowed(weekly_df)
+    stats = list(allowed.columns)
+
+    # Dense grid: every defense and position in every week of its season, so byes carry totals forward
+    weeks = played.groupby('season')['week'].max().reset_index()
+    weeks = pd.DataFrame({
+        'season': np.repeat(weeks['season'].to_numpy(), weeks['week'].to_numpy()),
+        'week': np.concatenate([np.arange(1, last + 1) for last in weeks['week']]) if len(weeks) else [],
+    })
+    pairs = allowed.reset_index()[['season', 'defense', 'position']].drop_duplicates()
+    grid = weeks.merge(pairs, on='season')
+    grid['week'] = grid['week'].astype(played['week'].dtype)
+
+    cube = grid.merge(allowed.reset_index(), on=INDEX, how='left')
+    cube[stats] = cube[stats].fillna(0)
+    cube = cube.merge(played.assign(played=1), on=['season', 'week', 'defense'], how='left')
+    cube['played'] = cube['played'].fillna(0)
+    cube = cube.sort_values(['season', 'defense', 'position', 'week']).reset_index(drop=True)
+
+    grouped = cube.groupby(['season', 'defense', 'position'], sort=False)
+    totals = grouped[stats].cumsum()
+    cube['games'] = grouped['played'].cumsum().astype('int8')
+    cube = cube[INDEX + ['games']].join(totals.add_suffix('_total'))
+    return _finish(cube, stats).set_index(INDEX).sort_index()
+
+
+def update_matchup_cube(cube, weekly_df, season, week):
+    """Return cube with (season, week) rebuilt from week - 1's totals plus that week's rows.
+
+    Earlier weeks of the season are only rebuilt when a (defense, position) pair first appears.
+    """
+    stats = [col[:-len('_total')] for col in cube.columns if col.endswith('_total')]
+    allowed, played = _weekly_allowed(weekly_df[(weekly_df['season'] == season) & (weekly_df['week'] == week)])
+    total_columns = [f'{stat}_total' for stat in stats]
+
+    existing = cube.reset_index()
+    earlier = existing[(existing['season'] == season) & (existing['week'] < week)]
+    previous = earlier[earlier['week'] == week - 1].set_index(['defense', 'position'])[total_columns + ['games']]
+
+    new = allowed.reset_index().set_index(['defense', 'position'])
+    new = new.reindex(columns=stats).fillna(0).add_suffix('_total')
+    keys = previous.index.union(new.index)
+    totals = previous[total_columns].reindex(keys, fill_value=0) + new.reindex(keys, fill_value=0)
+
+    # Games are counted per defense, whatever the position
+    defense_games = previous['games'].groupby(level='defense').max()
+    games = defense_games.reindex(keys.get_level_values('defense'), fill_value=0).to_numpy()
+    games = games + keys.get_level_values('defense').isin(set(played['defense'])).astype('int8')
+
+    replaced = (cube.index.get_level_values('season') == season) & (cube.index.get_level_values('week') == week)
+    new_pairs = keys.difference(previous.index)
+    if len(new_pairs) and week > 1:
+        # As in the full build, a pair first seen this week gets zero totals in the earlier weeks,
+        # which can shift those weeks' ranks, so they are finished again
+        backfill = pd.DataFrame(new_pairs.tolist(), columns=['defense', 'position']).merge(
+            pd.DataFrame({'week': range(1, week)}), how='cross')
+        earlier_games = earlier.groupby(['week', 'defense'])['games'].max()
+        backfill['games'] = earlier_games.reindex(
+            pd.MultiIndex.from_frame(backfill[['week', 'defense']])).fillna(0).to_numpy()
+        backfill[total_columns] = 0.0
+        backfill.insert(0, 'season', season)
+        columns = INDEX + ['games'] + total_columns
+        earlier = _finish(pd.concat([earlier[columns], backfill[columns]], ignore_index=True), stats)
+        replaced |= (cube.index.get_level_values('season') == season) & (cube.index.get_level_values('week') < week)
+    else:
+        earlier = earlier.iloc[:0]
+
+    week_rows = totals.reset_index()
+    week_rows.insert(0, 'week', week)
+    week_rows.insert(0, 'season', season)
+    week_rows['games'] = games.astype('int8')
+    week_rows = _finish(week_rows[INDEX + ['games'] + total_columns], stats)
+    rows = pd.concat([earlier[week_rows.columns], week_rows]).set_index(INDEX)
+    return pd.concat([cube[~replaced], rows.astype(cube.dtypes.to_dict())]).sort_index()
+
+
+def matchup_for(cube, season, week, defense, position):
+    """One defense's row for a position as of a week, or None when it is not in the cube.
+
+    The cube stops at the season's last played week. A later week, e.g. the
+    week before a game that follows a bye, reads that last week instead.
+    """
+    try:
+        rows = cube.index.get_loc(season)
+        last_week = cube.index[rows.stop - 1][1]
+        return cube.loc[(season, min(week, last_week), defense, position)]
+    except (KeyError, TypeError, AttributeError, IndexError):
+        return None
@@ -0,0 +1,129 @@
+"""Concurrent per-event odds ingestion for the odds API.
+
+Player-prop markets are served per event, so a full slate is one events
+call plus one odds call per game. OddsIngestor runs the per-event calls
+on a thread pool over a single pooled session. Every request has
+timeouts and retries with backoff. The provider's quota headers are
+tracked on every attempt, retried ones included, so a refresh stops
+before it exhausts the request budget.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from nflstats.props import STAT_MARKETS
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = 'https://api.the-odds-api.com'
+PROP_MARKETS = list(STAT_MARKETS.values())
+
+
+class _QuotaRetry(Retry):
+    """Retry that reports each retried response's headers; the provider charges every attempt."""
+
+    def __init__(self, *args, on_response=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.on_response = on_response
+
+    def new(self, **kwargs):
+        retry = super().new(**kwargs)
+        retry.on_response = self.on_response
+        return retry
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        if response is not None and self.on_response is not None:
+            self.on_response(response.headers)
+        return super().increment(method, url, response, error, _pool, _stacktrace)
+
+
+class OddsIngestor:
+
+    def __init__(self, api_key, base_url=BASE_URL, max_workers=8, timeout=(3.05, 10),
+                 retries=3, backoff_factor=0.5, min_remaining=0):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip('/')
+        self.max_workers = max_workers
+        self.timeout = timeout
+        # Stop issuing requests once the provider reports this many or fewer left
+        self.min_remaining = min_remaining
+
+        retry = _QuotaRetry(
+            on_response=self._record_quota,
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=['GET'],
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.quota = {'remaining': None, 'used': None, 'last_cost': None}
+        self.requests_made = 0
+        self.cost = 0
+        self._lock = threading.Lock()
+
+    def _record_quota(self, headers):
+        with self._lock:
+            self.requests_made += 1
+            for key, header in (('remaining', 'x-requests-remaining'), ('used', 'x-requests-used'),
+                                ('last_cost', 'x-requests-last')):
+                if header in headers:
+                    self.quota[key] = int(float(headers[header]))
+            # Only charge this call when it reported its own cost
+            if 'x-requests-last' in headers:
+                self.cost += self.quota['last_cost']
+
+    def budget_exhausted(self):
+        remaining = self.quota['remaining']
+        return remaining is not None and remaining <= self.min_remaining
+
+    def _get(self, path, **params):
+        response = self.session.get(
+            f'{self.base_url}{path}',
+            params={'apiKey': self.api_key, **params},
+            timeout=self.timeout,
+        )
+        self._record_quota(response.headers)
+        response.raise_for_status()
+        return response.json()
+
+    def fetch_events(self, sport):
+        return self._get(f'/v4/sports/{sport}/events')
+
+    def fetch_event_odds(self, sport, event_id, markets=PROP_MARKETS, regions='us'):
+        return self._get(
+            f'/v4/sports/{sport}/events/{event_id}/odds',
+            regions=regions,
+            markets=','.join(markets),
+            oddsFormat='decimal',
+        )
+
+    def fetch_slate(self, sport='americanfootball_nfl', markets=PROP_MARKETS, regions='us'):
+        """Odds for every upcoming event, in the same shape as the /odds endpoint returns.
+
+        Events that fail after retries, or are skipped because the quota
+        ran out, are logged and left out of the result.
+        """
+        events = self.fetch_events(sport)
+
+        def fetch(event):
+            if self.budget_exhausted():
+                logger.warning("Odds quota exhausted, skipping event %s", event.get('id'))
+                return None
+            try:
+                return self.fetch_event_odds(sport, event['id'], markets, regions)
+            except requests.RequestException as e:
+                logger.warning("Fetching odds for event %s failed: %s", event.get('id'), e)
+                return None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            results = list(pool.map(fetch, events))
+        return [result for result in results if result]
@@ -0,0 +1,159 @@
+"""Append-only SQLite store of odds snapshots.
+
+Every odds fetch is stored as a time-stamped snapshot of flattened
+outcome rows (see props.flatten_odds). Rows are indexed by
+(event, player, market, book) and by (player, market, book, time), so the
+latest snapshot, opening and current lines, and the full line movement
+for a prop are each one indexed query.
+
+SQLite connections are not shared between threads: thread_connection
+opens one per thread. claim_refresh hands out at most one API fetch per
+TTL window across every thread and worker process, whether or not that
+fetch succeeds.
+"""
+import time
+import sqlite3
+import threading
+
+import pandas as pd
+
+from nflstats import store
+from nflstats.props import OUTCOME_COLUMNS, STAT_MARKETS, normalize_player_name
+
+DB_PATH = store.DATA_DIR / 'odds_history.sqlite'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    snapshot_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS prop_lines (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (snapshot_id),
+    fetched_at REAL NOT NULL,
+    event_id TEXT,
+    commence_time TEXT,
+    home_team TEXT,
+    away_team TEXT,
+    book TEXT,
+    market TEXT,
+    player TEXT,
+    player_key TEXT,
+    side TEXT,
+    point REAL,
+    price REAL
+);
+CREATE INDEX IF NOT EXISTS prop_lines_event ON prop_lines (event_id, player_key, market, book, fetched_at);
+CREATE INDEX IF NOT EXISTS prop_lines_player ON prop_lines (player_key, market, book, fetched_at);
+CREATE INDEX IF NOT EXISTS prop_lines_snapshot ON prop_lines (snapshot_id);
+CREATE TABLE IF NOT EXISTS fetch_attempts (
+    attempted_at REAL NOT NULL
+);
+"""
+
+_local = threading.local()
+
+
+def connect(path=DB_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=30)
+    # WAL lets other workers keep reading while one appends a snapshot
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def thread_connection(path=DB_PATH):
+    """The calling thread's connection to the store, opened on first use."""
+    connections = _local.__dict__.setdefault('connections', {})
+    if path not in connections:
+        connections[path] = connect(path)
+    return connections[path]
+
+
+def claim_refresh(conn, ttl_seconds, now=None):
+    """True when the caller should fetch fresh odds, which it then owns for the next ttl_seconds.
+
+    The newest snapshot and the newest attempt both count, so a failed or
+    empty fetch still holds off the next one until the window has passed.
+    """
+    now = now or time.time()
+    with conn:
+        # Take the write lock first, so concurrent callers check and claim one at a time
+        conn.execute('BEGIN IMMEDIATE')
+        last = conn.execute(
+            'SELECT MAX(at) FROM (SELECT MAX(attempted_at) AS at FROM fetch_attempts '
+            'UNION ALL SELECT MAX(fetched_at) FROM snapshots)'
+        ).fetchone()[0]
+        if last is not None and now - last < ttl_seconds:
+            return False
+        conn.execute('DELETE FROM fetch_attempts')
+        conn.execute('INSERT INTO fetch_attempts (attempted_at) VALUES (?)', (now,))
+    return True
+
+
+def record_snapshot(conn, outcomes, fetched_at=None):
+    """Append flattened outcome rows as a new snapshot and return its id."""
+    fetched_at = fetched_at or time.time()
+    with conn:
+        snapshot_id = conn.execute('INSERT INTO snapshots (fetched_at) VALUES (?)', (fetched_at,)).lastrowid
+        rows = outcomes[OUTCOME_COLUMNS].astype(object).where(outcomes[OUTCOME_COLUMNS].notna(), None)
+        conn.executemany(
+            f"INSERT INTO prop_lines (snapshot_id, fetched_at, {', '.join(OUTCOME_COLUMNS)}) "
+            f"VALUES (?, ?, {', '.join('?' * len(OUTCOME_COLUMNS))})",
+            ((snapshot_id, fetched_at, *row) for row in rows.itertuples(index=False)),
+        )
+    return snapshot_id
+
+
+def latest_snapshot(conn):
+    """(snapshot_id, fetched_at) of the newest snapshot, or None if the store is empty."""
+    return conn.execute(
+        'SELECT snapshot_id, fetched_at FROM snapshots ORDER BY snapshot_id DESC LIMIT 1'
+    ).fetchone()
+
+
+def read_snapshot(conn, snapshot_id):
+    """The outcome rows of one snapshot, in the shape props.flatten_odds produces."""
+    return pd.read_sql_query(
+        f"SELECT {', '.join(OUTCOME_COLUMNS)} FROM prop_lines WHERE snapshot_id = ?",
+        conn, params=(snapshot_id,),
+    )
+
+
+def line_history(conn, event_id, player_name, stat_type, side='Over'):
+    """Every stored line for a player's prop in one game, one row per (book, fetch), oldest first."""
+    market = STAT_MARKETS.get(stat_type)
+    history = pd.read_sql_query(
+        'SELECT fetched_at, event_id, book, point, price FROM prop_lines '
+        'WHERE event_id = ? AND player_key = ? AND market = ? AND side = ? ORDER BY fetched_at',
+        conn, params=(event_id, normalize_player_name(player_name), market, side),
+    )
+    history['fetched_at'] = pd.to_datetime(history['fetched_at'], unit='s')
+    return history
+
+
+def line_summary(history):
+    """Opening line, current line and movement per (event, book) from line_history()."""
+    if history.empty:
+        return pd.DataFrame(columns=['opening', 'current', 'movement'])
+    by_book = history.groupby(['event_id', 'book'])['point']
+    summary = pd.DataFrame({'opening': by_book.first(), 'current': by_book.last()})
+    summary['movement'] = summary['current'] - summary['opening']
+    return summary
+
+
+def closing_lines(conn, side='Over'):
+    """Consensus closing line per (game date, player, market): each book's last line fetched before kickoff."""
+    lines = pd.read_sql_query(
+        'SELECT commence_time, player_key, market, book, point, price FROM prop_lines p '
+        'WHERE side = ? AND point IS NOT NULL AND fetched_at = ('
+        '  SELECT MAX(fetched_at) FROM prop_lines q'
+        '  WHERE q.event_id = p.event_id AND q.player_key = p.player_key AND q.market = p.market'
+        '  AND q.book = p.book AND q.side = p.side AND q.fetched_at <= CAST(strftime(\'%s\', p.commence_time) AS REAL))',
+        conn, params=(side,),
+    )
+    lines['gameday'] = pd.to_datetime(lines['commence_time'], utc=True).dt.tz_convert('US/Eastern').dt.strftime('%Y-%m-%d')
+    return (
+        lines.groupby(['gameday', 'player_key', 'market'], as_index=False)
+        .agg(line=('point', 'mean'), price=('price', 'median'))
+    )
@@ -0,0 +1,49 @@
+"""Build the analysis tables directly from the season store, without Streamlit.
+
+The pages go through nflstats.loaders, which shares these tables across
+sessions and workers. Batch jobs and command-line tools call these
+functions instead.
+"""
+from nflstats import columns, defense, enrich, schedule, store, usage
+from nflstats.player_index import PlayerIndex
+
+
+def load_enriched_data(features=columns.PAGE_FEATURES):
+    """(enriched weekly frame, roster frame) for the given page features."""
+    roster_df = enrich.prepare_roster(
+        store.load('weekly_rosters', store.ROSTER_SEASONS, columns.manifest((), columns.ROSTER_COLUMNS))
+    )
+    weekly_df = store.load('weekly', store.SEASONS, columns.manifest(features))
+    return enrich.enrich_weekly(weekly_df, roster_df), roster_df
+
+
+def load_player_index(features=columns.PAGE_FEATURES):
+    weekly_df, roster_df = load_enriched_data(features)
+    return PlayerIndex(weekly_df, roster_df, enrich.name_column)
+
+
+def load_schedule_tables():
+    """(team_games, next_games) for every season in the stats range."""
+    team_games = schedule.build_team_games(store.load('schedules', store.SEASONS))
+    return team_games, schedule.build_next_games(team_games)
+
+
+def load_defense_to_date(weekly_df, team_games):
+    return defense.build_defense_to_date(defense.build_defense_weeks(weekly_df, team_games))
+
+
+def load_prop_tables(features=columns.PAGE_FEATURES):
+    """(player index, next_games, to-date defense table) from one read of the store.
+
+    The defense table is built from the full enriched weekly frame, as the
+    pages build it, not from the player index's deduplicated frame.
+    """
+    weekly_df, roster_df = load_enriched_data(features)
+    team_games, next_games = load_schedule_tables()
+    player_index = PlayerIndex(weekly_df, roster_df, enrich.name_column)
+    return player_index, next_games, load_defense_to_date(weekly_df, team_games)
+
+
+def load_usage():
+    """Play-by-play usage for every season, indexed by (season, player_id)."""
+    return usage.usage_index(store.load('usage', store.SEASONS))
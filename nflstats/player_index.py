@@ -0,0 +1,90 @@
+"""Per-player index over the enriched weekly frame.
+
+The frame is sorted once by (season, player, week) with repeated weeks
+dropped, so each player's season is a contiguous block of rows. Selecting
+a player is then a dict lookup plus an iloc slice instead of a full-column
+string comparison followed by a sort.
+"""
+import sys
+
+import numpy as np
+
+
+def sorted_player_frame(df, name_column='full_name'):
+    """df sorted by (season, player, week) with repeated weeks and unnamed rows dropped."""
+    frame = df.dropna(subset=[name_column])
+    frame = frame.sort_values(['season', name_column, 'week'], kind='stable')
+    frame = frame.drop_duplicates(subset=['season', name_column, 'week'])
+    return frame.reset_index(drop=True)
+
+
+class PlayerIndex:
+    """Slice dicts over a sorted player frame.
+
+    With presorted=True, df must come from sorted_player_frame and is used
+    as-is, so a frame shared between workers is not copied.
+    """
+
+    def __init__(self, df, roster_df, name_column='full_name', presorted=False):
+        self.name_column = name_column
+        self.frame = df if presorted else sorted_player_frame(df, name_column)
+
+        # Each block of rows sharing (season, player) becomes one (start, stop) slice
+        seasons = self.frame['season'].to_numpy()
+        names = self.frame[name_column].astype(str).to_numpy()
+        if len(self.frame):
+            changed = np.r_[True, (seasons[1:] != seasons[:-1]) | (names[1:] != names[:-1])]
+        else:
+            changed = np.zeros(0, dtype=bool)
+        starts = np.flatnonzero(changed)
+        stops = np.r_[starts[1:], len(self.frame)]
+        self.slices = {
+            (int(seasons[start]), names[start]): (int(start), int(stop))
+            for start, stop in zip(starts, stops)
+        }
+
+        self.season_players = {}
+        for season, name in self.slices:
+            self.season_players.setdefault(season, []).append(name)
+        for players in self.season_players.values():
+            players.sort()
+
+        # The roster dimension is sorted by valid-from week, so the last row is the latest
+        roster = roster_df.dropna(subset=[name_column])
+        latest = roster.drop_duplicates(subset=[name_column], keep='last')
+        self.roster = latest.set_index(name_column).to_dict('index')
+        by_season = roster.drop_duplicates(subset=['season', name_column], keep='last')
+        self.season_roster = {
+            (int(row['season']), row[name_column]): row
+            for row in by_season.to_dict('records')
+        }
+
+    @property
+    def seasons(self):
+        return sorted(self.season_players)
+
+    @property
+    def nbytes(self):
+        # The frame may be a shared snapshot; count only the dicts this index adds
+        return sum(sys.getsizeof(d) for d in (self.slices, self.season_players, self.roster, self.season_roster))
+
+    def players(self, season):
+        """Sorted names of the players with stats in a season."""
+        return self.season_players.get(int(season), [])
+
+    def rows(self, season, name):
+        """The player's games for a season, sorted by week with one row per week.
+
+        Returns a copy, so callers can add columns without touching the shared frame.
+        """
+        start, stop = self.slices.get((int(season), name), (0, 0))
+        return self.frame.iloc[start:stop].copy()
+
+    def info(self, name, season=None):
+        """Roster details for a player as a dict, empty if the player has no roster entry.
+
+        With a season, the player's last roster row of that season, falling back to the latest.
+        """
+        if season is not None and (int(season), name) in self.season_roster:
+            return self.season_roster[(int(season), name)]
+        return self.roster.get(name, {})
@@ -0,0 +1,101 @@
+"""Player-prop book parsed once per odds fetch.
+
+The odds payload is flattened into one row per outcome. The rows are then
+indexed by (normalized player name, market). Player names are matched
+exactly after normalization, so "Josh Allen" never picks up
+"Josh Allen Jr." the way a substring check would.
+"""
+import re
+import unicodedata
+
+import pandas as pd
+
+# Display stat -> odds provider market key
+STAT_MARKETS = {
+    'Passing Yards': 'player_pass_yds',
+    'Rushing Yards': 'player_rush_yds',
+    'Receiving Yards': 'player_rec_yds',
+    'Receptions': 'player_receptions',
+    'Passing TDs': 'player_pass_tds',
+    'Rushing TDs': 'player_rush_tds',
+    'Receiving TDs': 'player_rec_tds',
+    'Total TDs': 'player_total_tds',
+}
+
+OUTCOME_COLUMNS = [
+    'event_id', 'commence_time', 'home_team', 'away_team',
+    'book', 'market', 'player', 'player_key', 'side', 'point', 'price',
+]
+
+
+def normalize_player_name(name):
+    """Lowercase, strip accents and punctuation, and collapse whitespace. Suffixes are kept."""
+    name = unicodedata.normalize('NFKD', str(name)).encode('ascii', 'ignore').decode()
+    name = re.sub(r"[.'’]", '', name.lower())
+    name = re.sub(r'[^a-z0-9]+', ' ', name)
+    return name.strip()
+
+
+def normalize_player_names(names):
+    """Vectorized normalize_player_name over a Series of names."""
+    names = names.astype(str).str.normalize('NFKD').str.encode('ascii', 'ignore').str.decode('ascii')
+    names = names.str.lower().str.replace(r"[.'’]", '', regex=True)
+    return names.str.replace(r'[^a-z0-9]+', ' ', regex=True).str.strip()
+
+
+def flatten_odds(odds_json):
+    """One row per (event, book, market, outcome) from an odds API payload."""
+    rows = []
+    for game in odds_json or []:
+        for bookmaker in game.get('bookmakers', []):
+            for market in bookmaker.get('markets', []):
+                for outcome in market.get('outcomes', []):
+                    player = outcome.get('description')
+                    if not player:
+                        continue
+                    rows.append((
+                        game.get('id'), game.get('commence_time'), game.get('home_team'), game.get('away_team'),
+                        bookmaker.get('key'), market.get('key'), player, normalize_player_name(player),
+                        outcome.get('name'), outcome.get('point'), outcome.get('price'),
+                    ))
+    return pd.DataFrame(rows, columns=OUTCOME_COLUMNS)
+
+
+def build_prop_book(outcomes):
+    """Index outcome rows by (player_key, market).
+
+    Each entry holds the per-book line and over/under prices, the mean
+    ('consensus') and median line across books, and the event the prop is for.
+    """
+    outcomes = outcomes.dropna(subset=['point'])
+    if outcomes.empty:
+        return {}
+    sides = outcomes.assign(side=outcomes['side'].str.lower())
+    keys = ['player_key', 'market', 'book']
+
+    # One row per (player, market, book) with the line and both prices
+    lines = sides.groupby(keys, sort=False)['point'].first()
+    prices = sides.pivot_table(index=keys, columns='side', values='price', aggfunc='first')
+    by_book = pd.concat([lines, prices.reindex(columns=['over', 'under'])], axis=1).reset_index()
+    events = sides.groupby(['player_key', 'market'], sort=False)['event_id'].first()
+
+    book = {}
+    for (player_key, market), group in by_book.groupby(['player_key', 'market'], sort=False):
+        book[(player_key, market)] = {
+            'books': {
+                row.book: {'point': row.point, 'over_price': row.over, 'under_price': row.under}
+                for row in group.itertuples(index=False)
+            },
+            'consensus': float(group['point'].mean()),
+            'median': float(group['point'].median()),
+            'event_id': events[(player_key, market)],
+        }
+    return book
+
+
+def lookup_prop(book, player_name, stat_type):
+    """Entry for a player and display stat, or None when no book offers it."""
+    market = STAT_MARKETS.get(stat_type)
+    if market is None:
+        return None
+    return book.get((normalize_player_name(player_name), market))
@@ -0,0 +1,60 @@
+"""Schedule tables indexed by (season, team, week) for constant-time lookups."""
+import pandas as pd
+
+# Highest week number a lookup can ask about (regular season plus playoffs)
+MAX_WEEK = 22
+
+
+def build_team_games(schedule_df):
+    """One row per team per game, indexed by (season, team, week)."""
+    games = schedule_df[['game_id', 'season', 'week', 'home_team', 'away_team', 'home_score', 'away_score']]
+    home = pd.DataFrame({
+        'season': games['season'], 'week': games['week'], 'game_id': games['game_id'],
+        'team': games['home_team'], 'opponent': games['away_team'], 'is_home': True,
+        'points_for': games['home_score'], 'points_allowed': games['away_score'],
+    })
+    away = pd.DataFrame({
+        'season': games['season'], 'week': games['week'], 'game_id': games['game_id'],
+        'team': games['away_team'], 'opponent': games['home_team'], 'is_home': False,
+        'points_for': games['away_score'], 'points_allowed': games['home_score'],
+    })
+    team_games = pd.concat([home, away], ignore_index=True)
+    team_games['season'] = team_games['season'].astype('int16')
+    team_games['week'] = team_games['week'].astype('int8')
+    return team_games.set_index(['season', 'team', 'week']).sort_index()
+
+
+def build_next_games(team_games):
+    """Next game for every (season, team, after_week), indexed for O(1) lookups.
+
+    after_week runs from 0 to MAX_WEEK, so the lookup for "the first game
+    after the last week a player appeared" is a single hash read.
+    """
+    games = team_games.reset_index()[['season', 'team', 'week', 'opponent', 'is_home', 'game_id']]
+    teams = games[['season', 'team']].drop_duplicates()
+    grid = teams.merge(pd.DataFrame({'after_week': range(MAX_WEEK + 1)}), how='cross')
+    grid['after_week'] = grid['after_week'].astype('int8')
+
+    # First game strictly after each week, within the same season and team
+    next_games = pd.merge_asof(
+        grid.sort_values('after_week'),
+        games.sort_values('week'),
+        left_on='after_week',
+        right_on='week',
+        by=['season', 'team'],
+        direction='forward',
+        allow_exact_matches=False,
+    )
+    next_games = next_games.dropna(subset=['week'])
+    next_games['week'] = next_games['week'].astype('int8')
+    return next_games.set_index(['season', 'team', 'after_week']).sort_index()
+
+
+def next_game(next_games, season, team, after_week):
+    """Return the (week, opponent, is_home, game_id) row of a team's next game, or None."""
+    key = (season, team, min(int(after_week), MAX_WEEK))
+    try:
+        return next_games.loc[key]
+    except (KeyError, TypeError):
+        # Unknown team (e.g. a player with no roster entry) or no games left
+        return None
@@ -0,0 +1,80 @@
+"""Compact dtype schema for the weekly stats frame.
+
+nfl_data_py returns object columns for strings that repeat on every row and
+float64 for every stat. Applying WEEKLY_SCHEMA at load time stores those
+as categoricals, small integers and float32 instead.
+
+Run `python -m nflstats.schema` for a before/after memory report.
+"""
+import pandas as pd
+
+CATEGORY_COLUMNS = [
+    'player_id', 'player_name', 'player_display_name', 'position', 'position_group',
+    'headshot_url', 'recent_team', 'season_type', 'opponent_team',
+    # Added by the roster merge
+    'full_name', 'headshot_url_roster', 'team',
+]
+
+INT16_COLUMNS = ['season']
+
+INT8_COLUMNS = [
+    'week',
+    'completions', 'attempts', 'passing_tds', 'interceptions', 'sacks',
+    'sack_fumbles', 'sack_fumbles_lost', 'passing_first_downs', 'passing_2pt_conversions',
+    'carries', 'rushing_tds', 'rushing_fumbles', 'rushing_fumbles_lost',
+    'rushing_first_downs', 'rushing_2pt_conversions',
+    'receptions', 'targets', 'receiving_tds', 'receiving_fumbles', 'receiving_fumbles_lost',
+    'receiving_first_downs', 'receiving_2pt_conversions', 'special_teams_tds',
+]
+
+# Column -> dtype; any other float64 column (yards, EPA, shares, fantasy points) becomes float32
+WEEKLY_SCHEMA = {
+    **{col: 'category' for col in CATEGORY_COLUMNS},
+    **{col: 'int16' for col in INT16_COLUMNS},
+    **{col: 'int8' for col in INT8_COLUMNS},
+}
+
+
+def apply_schema(df, schema=WEEKLY_SCHEMA):
+    """Return df with the compact dtypes applied. Already-compact columns are left alone."""
+    converted = {}
+    for col in df.columns:
+        series = df[col]
+        dtype = schema.get(col)
+        if dtype == 'category':
+            if not isinstance(series.dtype, pd.CategoricalDtype):
+                converted[col] = series.astype('category')
+        elif dtype in ('int8', 'int16'):
+            # Integer dtypes cannot hold NaN; such columns stay floating point
+            if series.dtype != dtype and pd.api.types.is_numeric_dtype(series):
+                converted[col] = series.astype(dtype if series.notna().all() else 'float32')
+        elif series.dtype == 'float64':
+            converted[col] = series.astype('float32')
+    if not converted:
+        return df
+    return df.assign(**converted)
+
+
+def memory_report(before, after):
+    """Per-column dtype and deep memory usage of two versions of a frame."""
+    report = pd.DataFrame({
+        'dtype_before': before.dtypes.astype(str),
+        'dtype_after': after.dtypes.astype(str),
+        'bytes_before': before.memory_usage(deep=True, index=False),
+        'bytes_after': after.memory_usage(deep=True, index=False),
+    })
+    report.loc['TOTAL', ['bytes_before', 'bytes_after']] = [
+        report['bytes_before'].sum(), report['bytes_after'].sum()
+    ]
+    report['ratio'] = report['bytes_before'] / report['bytes_after']
+    return report
+
+
+if __name__ == '__main__':
+    import nfl_data_py as nfl
+    from nflstats.store import SEASONS
+
+    raw = nfl.import_weekly_data(SEASONS)
+    report = memory_report(raw, apply_schema(raw))
+    with pd.option_context('display.max_rows', None, 'display.width', 120):
+        print(report)
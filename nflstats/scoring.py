@@ -0,0 +1,132 @@
+"""Configurable fantasy scoring for every player-week at once.
+
+A rule set is a plain dict:
+
+    {
+        'points': {stat column: points per unit},
+        'position_points': {position: {stat column: extra points per unit}},
+        'bonuses': [{'stat': column, 'threshold': value, 'points': points}],
+    }
+
+ScoringEngine turns the weekly frame into a float32 stat matrix once.
+Scoring a rule set is one matrix product against a (position x stat)
+weight matrix, plus a threshold comparison for the bonuses. Results are
+cached by a hash of the rule set, so switching leagues back and forth
+costs nothing.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from nflstats.columns import SCORING_COLUMNS
+
+STANDARD = {
+    'points': {
+        'passing_yards': 0.04, 'passing_tds': 4, 'interceptions': -2,
+        'rushing_yards': 0.1, 'rushing_tds': 6,
+        'receiving_yards': 0.1, 'receiving_tds': 6,
+        'sack_fumbles_lost': -2, 'rushing_fumbles_lost': -2, 'receiving_fumbles_lost': -2,
+        'passing_2pt_conversions': 2, 'rushing_2pt_conversions': 2, 'receiving_2pt_conversions': 2,
+        'special_teams_tds': 6,
+    },
+    'position_points': {},
+    'bonuses': [],
+}
+
+
+def _with(rules, points=None, position_points=None, bonuses=None):
+    return {
+        'points': {**rules['points'], **(points or {})},
+        'position_points': {**rules['position_points'], **(position_points or {})},
+        'bonuses': rules['bonuses'] + (bonuses or []),
+    }
+
+
+PPR = _with(STANDARD, points={'receptions': 1})
+HALF_PPR = _with(STANDARD, points={'receptions': 0.5})
+
+PRESETS = {
+    'PPR': PPR,
+    'Half PPR': HALF_PPR,
+    'Standard': STANDARD,
+    'TE Premium (PPR)': _with(PPR, position_points={'TE': {'receptions': 0.5}}),
+    '6-pt Pass TD (PPR)': _with(PPR, points={'passing_tds': 6}),
+    'PPR + Yardage Bonuses': _with(PPR, bonuses=[
+        {'stat': 'passing_yards', 'threshold': 300, 'points': 3},
+        {'stat': 'rushing_yards', 'threshold': 100, 'points': 3},
+        {'stat': 'receiving_yards', 'threshold': 100, 'points': 3},
+    ]),
+}
+
+
+def rule_set_hash(rules):
+    """Stable hash of a rule set, independent of key order."""
+    return hashlib.sha1(json.dumps(rules, sort_keys=True).encode()).hexdigest()
+
+
+class ScoringEngine:
+
+    def __init__(self, player_frame, max_cached=16):
+        # Columns the frame does not have (e.g. pruned by the manifest) score as zero
+        self.columns = list(SCORING_COLUMNS)
+        stats = player_frame.reindex(columns=self.columns).fillna(0)
+        self.matrix = stats.to_numpy(dtype='float32')
+        self.index = player_frame.index
+        positions = player_frame['position'].astype(str).str.upper()
+        self.positions = sorted(positions.unique())
+        self.position_codes = pd.Categorical(positions, categories=self.positions).codes
+        self.max_cached = max_cached
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self):
+        return self.matrix.nbytes + self.position_codes.nbytes + sum(p.nbytes for p in self._cache.values())
+
+    def _weights(self, rules):
+        """(position x stat) weight matrix: base points plus each position's extras."""
+        column_ids = {col: i for i, col in enumerate(self.columns)}
+        unknown = set(rules['points']) - set(column_ids)
+        for extras in rules['position_points'].values():
+            unknown |= set(extras) - set(column_ids)
+        if unknown:
+            raise ValueError(f"Unknown scoring columns: {sorted(unknown)}")
+
+        base = np.zeros(len(self.columns), dtype='float32')
+        for col, points in rules['points'].items():
+            base[column_ids[col]] = points
+        weights = np.tile(base, (len(self.positions), 1))
+        for position, extras in rules['position_points'].items():
+            if position.upper() in self.positions:
+                row = self.positions.index(position.upper())
+                for col, points in extras.items():
+                    weights[row, column_ids[col]] += points
+        return weights
+
+    def _score(self, rules):
+        by_position = self.matrix @ self._weights(rules).T
+        points = by_position[np.arange(len(self.matrix)), self.position_codes]
+        if rules['bonuses']:
+            column_ids = [self.columns.index(bonus['stat']) for bonus in rules['bonuses']]
+            thresholds = np.array([bonus['threshold'] for bonus in rules['bonuses']], dtype='float32')
+            bonus_points = np.array([bonus['points'] for bonus in rules['bonuses']], dtype='float32')
+            points = points + (self.matrix[:, column_ids] >= thresholds).astype('float32') @ bonus_points
+        return points.astype('float32')
+
+    def points(self, rules):
+        """Fantasy points for every row of the frame as a Series aligned with its index."""
+        key = rule_set_hash(rules)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return pd.Series(self._cache[key], index=self.index, name='fantasy_points')
+        points = self._score(rules)
+        with self._lock:
+            self._cache[key] = points
+            while len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+        return pd.Series(points, index=self.index, name='fantasy_points')
@@ -0,0 +1,79 @@
+"""League-wide prop screener.
+
+Joins every offered over line against every player's game logs in a few
+batched pandas/NumPy passes. It scores each prop by empirical hit rate,
+last-3 vs season average (the metrics the player page shows) and edge
+over the bookmaker's implied probability.
+"""
+import pandas as pd
+
+from nflstats.insights import STAT_COLUMNS
+from nflstats.props import STAT_MARKETS, normalize_player_names
+
+MARKET_STATS = {market: STAT_COLUMNS[stat] for stat, market in STAT_MARKETS.items() if stat in STAT_COLUMNS}
+MARKET_LABELS = {market: stat for stat, market in STAT_MARKETS.items()}
+
+
+def consensus_overs(outcomes):
+    """One row per (player_key, market): mean over line, median over price and the number of books."""
+    overs = outcomes[outcomes['side'].str.lower() == 'over'].dropna(subset=['point', 'price'])
+    return (
+        overs.groupby(['player_key', 'market'], as_index=False)
+        .agg(line=('point', 'mean'), over_price=('price', 'median'), books=('book', 'nunique'))
+    )
+
+
+def recent_form(player_frame, season, name_column='full_name', window=3):
+    """Last-N and season averages for every player and stat, in long (player, stat) layout."""
+    season_frame = player_frame[player_frame['season'] == season]
+    stats = sorted(set(MARKET_STATS.values()) - {'total_tds'})
+    frame = season_frame[[name_column] + stats].assign(
+        total_tds=season_frame['rushing_tds'] + season_frame['receiving_tds']
+    )
+    frame[name_column] = frame[name_column].astype(str)
+    # The player frame is sorted by week within each player, so tail() is the most recent games
+    last_n = frame.groupby(name_column).tail(window).groupby(name_column).mean()
+    season_avg = frame.groupby(name_column).mean()
+    form = pd.DataFrame({
+        f'last_{window}_avg': last_n.stack(),
+        'season_avg': season_avg.stack(),
+    })
+    form.index.names = ['player', 'stat']
+    form['delta'] = form[f'last_{window}_avg'] - form['season_avg']
+    return form.reset_index()
+
+
+def screen_props(outcomes, player_frame, outcome_table, season, name_column='full_name'):
+    """Score every over line in an odds snapshot against the season's game logs.
+
+    Returns one row per (player, market) with the line, hit rate (plain and
+    recency-weighted), last-3 vs season delta, implied probability and
+    edge, sorted by edge.
+    """
+    props = consensus_overs(outcomes)
+    props = props[props['market'].isin(MARKET_STATS)].copy()
+    props['stat'] = props['market'].map(MARKET_STATS)
+    props['prop'] = props['market'].map(MARKET_LABELS)
+
+    # Match odds names to stats names on the normalized key
+    season_frame = player_frame[(player_frame['season'] == season) & player_frame[name_column].notna()]
+    name_keys = (
+        season_frame.assign(player=season_frame[name_column].astype(str), position=season_frame['position'].astype(str))
+        .groupby('player', as_index=False)['position'].last()
+    )
+    name_keys['player_key'] = normalize_player_names(name_keys['player'])
+    name_keys = name_keys.drop_duplicates(subset='player_key', keep=False)
+    props = props.merge(name_keys, on='player_key', how='inner')
+
+    queries = props.assign(season=season)[['season', 'player', 'stat', 'line']]
+    props = props.join(outcome_table.over_many(queries))
+    props = props.merge(recent_form(player_frame, season, name_column), on=['player', 'stat'], how='left')
+
+    props['implied_prob'] = 1.0 / props['over_price']
+    props['edge'] = props['p_over'] - props['implied_prob']
+    props['edge_weighted'] = props['p_over_weighted'] - props['implied_prob']
+    columns = [
+        'player', 'position', 'prop', 'line', 'over_price', 'books', 'games', 'hits', 'p_over', 'p_over_weighted',
+        'last_3_avg', 'season_avg', 'delta', 'implied_prob', 'edge', 'edge_weighted',
+    ]
+    return props[columns].sort_values('edge', ascending=False).reset_index(drop=True)
@@ -0,0 +1,117 @@
+"""Process-wide cache of read-only DataFrames shared by every session.
+
+st.cache_data pickles its return value and hands each caller a fresh copy.
+Frames stored here are returned as-is instead, so all sessions read the same
+buffers. Callers must treat them as immutable and copy any slice they
+want to modify.
+"""
+import threading
+import logging
+from collections import OrderedDict
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+def frame_nbytes(value):
+    """Approximate resident size of a frame, or of a tuple/list/dict of frames."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if isinstance(value, pd.DataFrame) else int(usage)
+    if isinstance(value, dict):
+        return sum(frame_nbytes(v) for v in value.values())
+    if isinstance(value, (tuple, list)):
+        return sum(frame_nbytes(v) for v in value)
+    # Index objects built over frames report their own size
+    return getattr(value, 'nbytes', 0)
+
+
+class SharedFrameCache:
+    """Named entries with a version token, bounded by max_bytes with LRU eviction.
+
+    Requesting a name with a new token replaces the old entry, so a store
+    refresh never leaves two generations of the same frame resident.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # name -> (token, value, nbytes)
+        self._build_locks = {}
+        self._lock = threading.Lock()
+
+    def _lookup(self, name, token):
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == token:
+            self._entries.move_to_end(name)
+            self.hits += 1
+            return True, entry[1]
+        return False, None
+
+    def get(self, name, token, build):
+        """Return the cached value for (name, token), calling build() on a miss."""
+        with self._lock:
+            found, value = self._lookup(name, token)
+            if found:
+                return value
+            build_lock = self._build_locks.setdefault(name, threading.Lock())
+
+        # Only one thread builds a given name; the others wait and reuse its result
+        with build_lock:
+            with self._lock:
+                found, value = self._lookup(name, token)
+                if found:
+                    return value
+                self.misses += 1
+            value = build()
+            nbytes = frame_nbytes(value)
+            with self._lock:
+                self._discard(name)
+                self._entries[name] = (token, value, nbytes)
+                self.total_bytes += nbytes
+                self._evict(keep=name)
+        return value
+
+    def peek(self, name):
+        """The (token, value) held for name whatever its token, or None. Not counted as a hit."""
+        with self._lock:
+            entry = self._entries.get(name)
+            return None if entry is None else entry[:2]
+
+    def _discard(self, name):
+        entry = self._entries.pop(name, None)
+        if entry is not None:
+            self.total_bytes -= entry[2]
+
+    def _evict(self, keep):
+        # Drop least recently used entries until under the cap, never the newest one
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            name = next(iter(self._entries))
+            if name == keep:
+                self._entries.move_to_end(name)
+                continue
+            self._discard(name)
+            self.evictions += 1
+            logger.info("Evicted %s from the shared frame cache", name)
+        if self.total_bytes > self.max_bytes:
+            logger.warning("Shared frame cache holds %d bytes, above its %d byte cap",
+                           self.total_bytes, self.max_bytes)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': list(self._entries),
+                'total_bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
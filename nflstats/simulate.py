@@ -0,0 +1,223 @@
+"""Monte Carlo prop simulator.
+
+Each prop's stat distribution is the player's weekly history for the
+season, resampled with recency weights and scaled by how many yards the
+upcoming opponent has allowed relative to the league. Yardage stats get
+kernel noise on top of the resampled games. Count stats are drawn as
+Poisson around each resampled game. One prop is a single vectorized
+NumPy draw. A slate is split into chunks across a process pool.
+
+Every prop gets its own child of one SeedSequence, so results are
+reproducible for a seed whatever the worker count or chunking.
+
+    python -m nflstats.simulate slate.csv --season 2024 --samples 100000
+    python -m nflstats.simulate --bench
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from nflstats import pipeline
+from nflstats.defense import ALLOWED_COLUMNS, defense_to_date
+from nflstats.hit_prob import HALF_LIFE
+from nflstats.insights import STAT_COLUMNS
+from nflstats.schedule import next_game
+
+SAMPLES = 100_000
+
+# The allowed-yards column that adjusts each stat; stats not listed are not opponent-adjusted
+ADJUSTMENT_COLUMNS = {
+    'passing_yards': 'passing_yards',
+    'passing_tds': 'passing_yards',
+    'rushing_yards': 'rushing_yards',
+    'rushing_tds': 'rushing_yards',
+    'receiving_yards': 'receiving_yards',
+    'receptions': 'receiving_yards',
+}
+COUNT_STATS = {'passing_tds', 'rushing_tds', 'receptions', 'total_tds'}
+
+# Opponent factors are shrunk toward 1 by games / (games + SHRINK_GAMES) and clipped
+SHRINK_GAMES = 4
+FACTOR_BOUNDS = (0.75, 1.25)
+
+
+def league_allowed(defense_table):
+    """Mean allowed per game across defenses with games played, by (season, as_of_week)."""
+    played = defense_table[defense_table['games'] > 0]
+    averages = played.groupby(level=['season', 'as_of_week'])[[f'avg_{col}' for col in ALLOWED_COLUMNS]].mean()
+    return averages.rename(columns=lambda col: col[len('avg_'):])
+
+
+def opponent_factor(defense_table, league, season, opponent, as_of_week, column):
+    """Shrunk, clipped ratio of what the opponent allows in a column to the league average."""
+    if opponent is None or column is None:
+        return 1.0
+    allowed = defense_to_date(defense_table, season, opponent, as_of_week)[column]
+    try:
+        games = float(defense_table.loc[(season, opponent, as_of_week), 'games'])
+        baseline = float(league.loc[(season, as_of_week), column])
+    except (KeyError, TypeError):
+        return 1.0
+    if not baseline or not games:
+        return 1.0
+    shrink = games / (games + SHRINK_GAMES)
+    return float(np.clip(1.0 + (allowed / baseline - 1.0) * shrink, *FACTOR_BOUNDS))
+
+
+def prop_task(player_index, next_games, defense_table, league, season, player, stat, line):
+    """Arrays the simulation needs for one prop, or None if the player has no games or the stat is unknown."""
+    column = STAT_COLUMNS.get(stat)
+    player_data = player_index.rows(season, player)
+    if player_data.empty or column is None:
+        return None
+    if column == 'total_tds':
+        values = player_data['rushing_tds'] + player_data['receiving_tds']
+    else:
+        values = player_data[column]
+    values = values.dropna().to_numpy(dtype='float64')
+    if not len(values):
+        return None
+
+    last_week_played = int(player_data['week'].max())
+    upcoming_game = next_game(next_games, season, player_index.info(player, season).get('team'), last_week_played)
+    opponent = upcoming_game['opponent'] if upcoming_game is not None else None
+    factor = opponent_factor(
+        defense_table, league, season, opponent, last_week_played, ADJUSTMENT_COLUMNS.get(column)
+    )
+    weights = 0.5 ** (np.arange(len(values))[::-1] / HALF_LIFE)
+    return {
+        'values': values, 'weights': weights / weights.sum(), 'factor': factor,
+        'line': float(line), 'count': column in COUNT_STATS, 'opponent': opponent,
+    }
+
+
+def simulate_prop(task, seed, samples=SAMPLES):
+    """Draw samples for one prop and summarize P(over) and intervals."""
+    rng = np.random.default_rng(seed)
+    values, factor = task['values'], task['factor']
+    games = values[rng.choice(len(values), size=samples, p=task['weights'])] * factor
+    if task['count']:
+        draws = rng.poisson(games).astype('float64')
+    else:
+        # Silverman's bandwidth, so a short history does not only ever reproduce past games
+        bandwidth = 1.06 * max(values.std(), 1.0) * len(values) ** -0.2 * factor
+        draws = np.maximum(games + rng.normal(0.0, bandwidth, samples), min(values.min(), 0.0))
+
+    line = task['line']
+    p_over = float((draws > line).mean())
+    # Wilson 95% interval for the Monte Carlo estimate of P(over)
+    z = 1.96
+    center = (p_over + z * z / (2 * samples)) / (1 + z * z / samples)
+    half_width = z * np.sqrt(p_over * (1 - p_over) / samples + z * z / (4 * samples ** 2)) / (1 + z * z / samples)
+    q05, q50, q95 = np.percentile(draws, [5, 50, 95])
+    return {
+        'p_over': p_over, 'p_over_low': center - half_width, 'p_over_high': center + half_width,
+        'p_push': float((draws == line).mean()), 'mean': float(draws.mean()),
+        'q05': q05, 'median': q50, 'q95': q95, 'factor': factor,
+    }
+
+
+def _simulate_chunk(tasks, seeds, samples):
+    return [simulate_prop(task, seed, samples) for task, seed in zip(tasks, seeds)]
+
+
+def simulate_slate(tasks, samples=SAMPLES, seed=0, workers=None, chunk_size=16):
+    """Simulate every task across a process pool; results keep the task order.
+
+    Tasks that are None (unknown player or stat) come back as None.
+    """
+    seeds = np.random.SeedSequence(seed).spawn(len(tasks))
+    runnable = [i for i, task in enumerate(tasks) if task is not None]
+    chunks = [runnable[i:i + chunk_size] for i in range(0, len(runnable), chunk_size)]
+    results = [None] * len(tasks)
+    if workers == 1:
+        outputs = (_simulate_chunk([tasks[i] for i in chunk], [seeds[i] for i in chunk], samples) for chunk in chunks)
+        for chunk, output in zip(chunks, outputs):
+            for i, result in zip(chunk, output):
+                results[i] = result
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_simulate_chunk, [tasks[i] for i in chunk], [seeds[i] for i in chunk], samples)
+            for chunk in chunks
+        ]
+        for chunk, future in zip(chunks, futures):
+            for i, result in zip(chunk, future.result()):
+                results[i] = result
+    return results
+
+
+def slate_tasks(slate, season):
+    """Simulation tasks for every slate row, built from the season store."""
+    player_index, next_games, defense_table = pipeline.load_prop_tables()
+    league = league_allowed(defense_table)
+    return [
+        prop_task(player_index, next_games, defense_table, league, season, row.player, row.stat, row.line)
+        for row in slate.itertuples(index=False)
+    ]
+
+
+def benchmark(props=256, samples=SAMPLES, games=17, seed=0):
+    """Time a synthetic slate at 1, 2, 4, ... workers up to the CPU count."""
+    rng = np.random.default_rng(seed)
+    tasks = []
+    for _ in range(props):
+        values = rng.gamma(2.0, 30.0, games)
+        weights = 0.5 ** (np.arange(games)[::-1] / HALF_LIFE)
+        tasks.append({'values': values, 'weights': weights / weights.sum(), 'factor': 1.0,
+                      'line': float(np.median(values)), 'count': False, 'opponent': None})
+
+    cpus = os.cpu_count() or 1
+    counts = sorted({1, cpus} | {2 ** i for i in range(cpus.bit_length()) if 2 ** i <= cpus})
+    rows = []
+    for workers in counts:
+        started = time.perf_counter()
+        simulate_slate(tasks, samples, seed, workers)
+        elapsed = time.perf_counter() - started
+        rows.append({'workers': workers, 'seconds': elapsed, 'props_per_second': props / elapsed})
+    timings = pd.DataFrame(rows)
+    timings['speedup'] = timings['seconds'].iloc[0] / timings['seconds']
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('slate', nargs='?', help='CSV with player, stat and line columns')
+    parser.add_argument('--season', type=int, default=2024)
+    parser.add_argument('--samples', type=int, default=SAMPLES)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--output', default=None, help='Write results to this CSV')
+    parser.add_argument('--bench', action='store_true', help='Benchmark scaling by worker count')
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        print(benchmark(samples=args.samples, seed=args.seed).to_string(index=False))
+        return
+    if not args.slate:
+        parser.error('a slate CSV is required unless --bench is given')
+
+    slate = pd.read_csv(args.slate)
+    tasks = slate_tasks(slate, args.season)
+    started = time.perf_counter()
+    results = simulate_slate(tasks, args.samples, args.seed, args.workers)
+    elapsed = time.perf_counter() - started
+
+    rows = [
+        {**row._asdict(), 'opponent': task['opponent'] if task else None, **(result or {})}
+        for row, task, result in zip(slate.itertuples(index=False), tasks, results)
+    ]
+    results = pd.DataFrame(rows)
+    print(f'{len(results)} props x {args.samples} samples in {elapsed:.1f}s')
+    print(results.to_string(index=False))
+    if args.output:
+        results.to_csv(args.output, index=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Arrow IPC snapshots of processed frames, memory-mapped by every worker.
+
+A snapshot is written once by whichever worker builds the frame first.
+Other workers then memory-map the file instead of downloading or parsing
+anything, so the OS page cache holds a single copy for all processes.
+Snapshots are uncompressed because compressed buffers cannot be mapped.
+"""
+import os
+import hashlib
+
+import pyarrow as pa
+
+from nflstats import store
+
+SNAPSHOT_DIR = store.DATA_DIR / 'snapshots'
+
+
+def snapshot_path(name, token):
+    # Tokens are tuples of plain values, so their repr is stable across processes
+    digest = hashlib.sha1(repr(token).encode()).hexdigest()[:16]
+    return SNAPSHOT_DIR / f'{name}-{digest}.arrow'
+
+
+def write_snapshot(name, token, df):
+    path = snapshot_path(name, token)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    table = pa.Table.from_pandas(df)
+
+    # Write to a temporary file first so readers never map a partial snapshot
+    tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+    with pa.OSFile(str(tmp_path), 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
+    # Older generations are no longer needed; workers still mapping them keep their pages
+    for old_path in SNAPSHOT_DIR.glob(f'{name}-*.arrow'):
+        if old_path != path:
+            old_path.unlink(missing_ok=True)
+    return path
+
+
+def read_snapshot(name, token):
+    """Memory-map a snapshot and return it as a DataFrame, or None if it does not exist."""
+    path = snapshot_path(name, token)
+    if not path.exists():
+        return None
+    table = pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+    # split_blocks lets null-free numeric columns point straight at the mapped pages
+    return table.to_pandas(split_blocks=True)
+
+
+def load(name, token, build):
+    """Return the snapshot for (name, token), building and writing it on a miss."""
+    df = read_snapshot(name, token)
+    if df is None:
+        df = build()
+        write_snapshot(name, token, df)
+    return df
@@ -0,0 +1,154 @@
+"""Local Parquet store for nfl_data_py datasets, partitioned by season.
+
+Completed seasons are fetched once more after they end and then never
+re-fetched. The season currently being played (or about to start) is
+refreshed once its partition is older than REFRESH_SECONDS. Sessions that
+find the same partition stale wait on one lock per (dataset, season), so
+it is fetched and written once.
+"""
+import os
+import time
+import uuid
+import logging
+import threading
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+import pyarrow.parquet as pq
+import nfl_data_py as nfl
+
+from nflstats.schema import WEEKLY_SCHEMA, apply_schema
+from nflstats.usage import USAGE_SCHEMA, fetch_usage
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(os.environ.get('NFL_DATA_DIR', Path(__file__).resolve().parent.parent / 'data'))
+
+# How long the in-progress season partition is trusted before re-fetching
+REFRESH_SECONDS = int(os.environ.get('NFL_REFRESH_SECONDS', 6 * 3600))
+
+# Seasons loaded by the app
+SEASONS = list(range(2020, 2025))
+
+# Seasons of roster data merged into the weekly stats
+ROSTER_SEASONS = SEASONS
+
+# Dataset name -> compact dtype schema applied when fetching and reading
+SCHEMAS = {
+    'weekly': WEEKLY_SCHEMA,
+    'weekly_rosters': WEEKLY_SCHEMA,
+    'usage': USAGE_SCHEMA,
+}
+
+# Dataset name -> function that fetches a list of seasons from nfl_data_py
+FETCHERS = {
+    'weekly': nfl.import_weekly_data,
+    'weekly_rosters': nfl.import_weekly_rosters,
+    'schedules': nfl.import_schedules,
+    # Aggregated from play-by-play, see nflstats.usage
+    'usage': fetch_usage,
+}
+
+# (dataset, season) -> lock held while that partition is fetched and written
+_partition_locks = {}
+_partition_locks_guard = threading.Lock()
+
+
+def partition_path(dataset, season):
+    return DATA_DIR / dataset / f'season={season}.parquet'
+
+
+def season_end(season):
+    """Timestamp after which a season is complete (its playoffs end in February)."""
+    return time.mktime(date(season + 1, 3, 1).timetuple())
+
+
+def _is_fresh(path, season, now):
+    if not path.exists():
+        return False
+    # A completed season is final once its partition was written after the season ended
+    if now >= season_end(season):
+        return path.stat().st_mtime >= season_end(season)
+    return now - path.stat().st_mtime < REFRESH_SECONDS
+
+
+def _partition_lock(dataset, season):
+    with _partition_locks_guard:
+        return _partition_locks.setdefault((dataset, season), threading.Lock())
+
+
+def _write_partition(df, path):
+    # Write to a temporary file first so readers never see a partial partition
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Sessions are threads of one process, so the pid alone does not make the name unique
+    tmp_path = path.with_suffix(f'.{os.getpid()}.{uuid.uuid4().hex}.tmp')
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def refresh(dataset, seasons, now=None):
+    """Fetch missing or stale partitions and return a fingerprint of the store."""
+    now = now or time.time()
+    fetch = FETCHERS[dataset]
+    for season in seasons:
+        path = partition_path(dataset, season)
+        if _is_fresh(path, season, now):
+            continue
+        with _partition_lock(dataset, season):
+            # Another session may have fetched it while this one waited for the lock
+            if _is_fresh(path, season, now):
+                continue
+            try:
+                df = fetch([season])
+            except Exception as e:
+                # Keep serving the last good partition if the upstream is down
+                if path.exists():
+                    logger.warning("Refreshing %s %s failed, using stored copy: %s", dataset, season, e)
+                    continue
+                raise
+            if dataset in SCHEMAS:
+                df = apply_schema(df, SCHEMAS[dataset])
+            _write_partition(df, path)
+    return fingerprint(dataset, seasons)
+
+
+def fingerprint(dataset, seasons):
+    """Identify the stored partitions, changing whenever one is rewritten."""
+    parts = []
+    for season in seasons:
+        path = partition_path(dataset, season)
+        if path.exists():
+            stat = path.stat()
+            parts.append((season, stat.st_mtime_ns, stat.st_size))
+    return (dataset, tuple(parts))
+
+
+def read(dataset, seasons, columns=None):
+    """Read the stored partitions for the given seasons into one frame.
+
+    With columns, only those columns are read; names missing from a
+    partition are skipped rather than raising.
+    """
+    frames = []
+    for season in seasons:
+        path = partition_path(dataset, season)
+        if not path.exists():
+            continue
+        if columns is not None:
+            available = set(pq.read_schema(path).names)
+            frames.append(pd.read_parquet(path, columns=[col for col in columns if col in available]))
+        else:
+            frames.append(pd.read_parquet(path))
+    if not frames:
+        return pd.DataFrame()
+    df = pd.concat(frames, ignore_index=True)
+    # Concatenating categoricals with different categories falls back to object
+    if dataset in SCHEMAS:
+        df = apply_schema(df, SCHEMAS[dataset])
+    return df
+
+
+def load(dataset, seasons, columns=None):
+    refresh(dataset, seasons)
+    return read(dataset, seasons, columns)
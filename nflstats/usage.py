@@ -0,0 +1,106 @@
+"""Player-week usage metrics aggregated from play-by-play data.
+
+A season of play-by-play is ~50k rows by ~400 columns. fetch_usage reads
+one season at a time with only PBP_COLUMNS. It reduces each season to one
+row per (season, week, team, player) before the next is read. The store
+writes one partition per season, so peak memory is one season's pruned
+plays, and the pages only ever read the aggregated partitions.
+"""
+import pandas as pd
+import nfl_data_py as nfl
+
+PBP_COLUMNS = [
+    'season', 'week', 'season_type', 'posteam', 'play_type', 'yardline_100',
+    'pass_attempt', 'rush_attempt', 'complete_pass', 'two_point_attempt', 'air_yards',
+    'receiver_player_id', 'rusher_player_id',
+]
+
+USAGE_COLUMNS = [
+    'targets', 'team_targets', 'target_share', 'air_yards', 'team_air_yards', 'air_yards_share', 'wopr',
+    'carries', 'team_carries', 'carry_share', 'red_zone_targets', 'red_zone_carries', 'red_zone_touches',
+    'goal_line_carries',
+]
+
+KEYS = ['season', 'week', 'team', 'player_id']
+
+# Bump whenever the output of aggregate_usage changes so shared copies are rebuilt
+USAGE_VERSION = 1
+
+# Column -> dtype for the stored aggregates; the shares and air yards become float32
+USAGE_SCHEMA = {
+    'season': 'int16', 'week': 'int8', 'team': 'category', 'player_id': 'category',
+    **{col: 'int16' for col in [
+        'targets', 'team_targets', 'carries', 'team_carries',
+        'red_zone_targets', 'red_zone_carries', 'red_zone_touches', 'goal_line_carries',
+    ]},
+}
+
+# Plays inside these yard lines count as red-zone and goal-line plays
+RED_ZONE = 20
+GOAL_LINE = 5
+
+
+def aggregate_usage(pbp):
+    """Reduce one season of play-by-play to usage per (season, week, team, player_id)."""
+    plays = pbp[pbp['two_point_attempt'].fillna(0) == 0].rename(columns={'posteam': 'team'})
+    red_zone = plays['yardline_100'] <= RED_ZONE
+
+    targets = plays[(plays['play_type'] == 'pass') & plays['receiver_player_id'].notna()]
+    targets = targets.assign(
+        player_id=targets['receiver_player_id'],
+        air_yards=targets['air_yards'].fillna(0),
+        red_zone_targets=red_zone[targets.index].astype('int16'),
+        red_zone_receptions=(red_zone[targets.index] & (targets['complete_pass'] == 1)).astype('int16'),
+    )
+    receiving = targets.groupby(KEYS, observed=True).agg(
+        targets=('play_type', 'size'), air_yards=('air_yards', 'sum'),
+        red_zone_targets=('red_zone_targets', 'sum'), red_zone_receptions=('red_zone_receptions', 'sum'),
+    )
+
+    carries = plays[(plays['play_type'] == 'run') & plays['rusher_player_id'].notna()]
+    carries = carries.assign(
+        player_id=carries['rusher_player_id'],
+        red_zone_carries=red_zone[carries.index].astype('int16'),
+        goal_line_carries=(carries['yardline_100'] <= GOAL_LINE).astype('int16'),
+    )
+    rushing = carries.groupby(KEYS, observed=True).agg(
+        carries=('play_type', 'size'), red_zone_carries=('red_zone_carries', 'sum'),
+        goal_line_carries=('goal_line_carries', 'sum'),
+    )
+
+    usage = receiving.join(rushing, how='outer').fillna(0).reset_index()
+    team = usage.groupby(['season', 'week', 'team'], observed=True)
+    usage['team_targets'] = team['targets'].transform('sum')
+    usage['team_air_yards'] = team['air_yards'].transform('sum')
+    usage['team_carries'] = team['carries'].transform('sum')
+    usage['target_share'] = usage['targets'] / usage['team_targets'].where(usage['team_targets'] > 0)
+    usage['air_yards_share'] = usage['air_yards'] / usage['team_air_yards'].where(usage['team_air_yards'] > 0)
+    usage['carry_share'] = usage['carries'] / usage['team_carries'].where(usage['team_carries'] > 0)
+    # Weighted opportunity rating, the usual 1.5 x target share + 0.7 x air yards share
+    usage['wopr'] = 1.5 * usage['target_share'].fillna(0) + 0.7 * usage['air_yards_share'].fillna(0)
+    usage['red_zone_touches'] = usage['red_zone_carries'] + usage['red_zone_receptions']
+    return usage[KEYS + USAGE_COLUMNS]
+
+
+def fetch_usage(seasons):
+    """Fetch and aggregate play-by-play one season at a time, keeping only the aggregates."""
+    frames = []
+    for season in seasons:
+        pbp = nfl.import_pbp_data([season], columns=PBP_COLUMNS, downcast=True, cache=False)
+        frames.append(aggregate_usage(pbp))
+        del pbp
+    return pd.concat(frames, ignore_index=True)
+
+
+def usage_index(usage):
+    """Usage indexed by (season, player_id), each player's weeks in order."""
+    usage = usage.assign(player_id=usage['player_id'].astype(str))
+    return usage.sort_values(['season', 'player_id', 'week']).set_index(['season', 'player_id'])
+
+
+def player_usage(usage, season, player_id):
+    """A player's usage rows for a season, empty if the season has no play-by-play."""
+    try:
+        return usage.loc[[(season, player_id)]]
+    except (KeyError, TypeError):
+        return usage.iloc[:0]
@@ -0,0 +1,58 @@
+import streamlit as st
+from nflstats.insights import STAT_COLUMNS
+from nflstats.leaderboards import WINDOWS
+from nflstats.loaders import get_fantasy_leaderboard, get_leaderboard
+from nflstats.scoring import PRESETS
+
+st.set_page_config(layout='wide', page_title='NFL Leaderboards')
+
+st.title('NFL Leaderboards')
+
+leaderboard = get_leaderboard()
+seasons = sorted(leaderboard.last_weeks)
+if not seasons:
+    st.warning('No stats loaded yet.')
+    st.stop()
+
+positions = list(leaderboard.table['position'].cat.categories)
+
+# Display name -> stat column; fantasy points are scored per league
+stat_options = {**STAT_COLUMNS, 'Targets': 'targets'}
+fantasy_options = {f'Fantasy Points ({name})': name for name in PRESETS}
+
+col1, col2, col3 = st.columns(3)
+with col1:
+    season = st.selectbox('Season', seasons, index=len(seasons) - 1)
+    week = st.slider('Through week', 1, leaderboard.last_weeks[season], leaderboard.last_weeks[season])
+with col2:
+    position = st.selectbox('Position', positions, index=positions.index('WR') if 'WR' in positions else 0)
+    stat_name = st.selectbox('Stat', list(stat_options) + list(fantasy_options),
+                             index=list(stat_options).index('Receiving Yards'))
+with col3:
+    window = st.selectbox('Window', list(WINDOWS), index=list(WINDOWS).index('Last 4 weeks'))
+    k = st.number_input('Top', min_value=5, max_value=100, value=25, step=5)
+
+if stat_name in fantasy_options:
+    board, stat = get_fantasy_leaderboard(PRESETS[fantasy_options[stat_name]]), 'fantasy_points'
+else:
+    board, stat = leaderboard, stat_options[stat_name]
+
+# Served from the presorted block; nothing is sorted here
+top = board.top(season, week, position, stat, window, int(k))
+st.subheader(f'Top {int(k)} {position} {stat_name}, {window.lower()} through week {week}')
+if top.empty:
+    st.info('No players match this selection.')
+else:
+    st.dataframe(
+        top[['rank', 'player', 'total', 'per_game', 'games', 'percentile']],
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            'rank': st.column_config.NumberColumn('Rank'),
+            'player': st.column_config.TextColumn('Player'),
+            'total': st.column_config.NumberColumn('Total', format='%.1f'),
+            'per_game': st.column_config.NumberColumn('Per Game', format='%.1f'),
+            'games': st.column_config.NumberColumn('Games'),
+            'percentile': st.column_config.NumberColumn('Percentile', format='%.0f'),
+        },
+    )
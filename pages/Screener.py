@@ -0,0 +1,62 @@
+import streamlit as st
+from datetime import datetime
+from nflstats import odds_history
+from nflstats.loaders import get_data_token, get_odds_history, get_outcome_table, get_player_index
+from nflstats.screener import screen_props
+
+st.set_page_config(layout='wide', page_title='NFL Prop Screener')
+
+st.title('NFL Prop Screener')
+st.caption('Every over line in the latest odds snapshot, scored against the season\'s game logs.')
+
+@st.cache_data
+def get_screen(snapshot_id, season, data_token):
+    # Scores the whole slate in one batched pass; cached per snapshot, season and weekly data version
+    outcomes = odds_history.read_snapshot(get_odds_history(), snapshot_id)
+    player_index = get_player_index()
+    return screen_props(outcomes, player_index.frame, get_outcome_table(), season, player_index.name_column)
+
+latest = odds_history.latest_snapshot(get_odds_history())
+if latest is None:
+    st.info('No odds snapshots stored yet. Open the NFL page to fetch the current lines.')
+    st.stop()
+
+try:
+    player_index = get_player_index()
+except ValueError as e:
+    st.error(str(e))
+    st.stop()
+
+col1, col2, col3 = st.columns(3)
+with col1:
+    season = st.selectbox('Season', player_index.seasons, index=len(player_index.seasons) - 1)
+screen = get_screen(latest[0], season, get_data_token())
+with col2:
+    props = st.multiselect('Props', sorted(screen['prop'].unique()))
+with col3:
+    positions = st.multiselect('Positions', sorted(screen['position'].unique()))
+min_games = st.slider('Minimum games', 1, 17, 4)
+
+view = screen[screen['games'] >= min_games]
+if props:
+    view = view[view['prop'].isin(props)]
+if positions:
+    view = view[view['position'].isin(positions)]
+
+fetched = datetime.fromtimestamp(latest[1]).strftime('%Y-%m-%d %H:%M')
+st.caption(f'{len(view)} props from the odds snapshot fetched {fetched}. Click a column header to sort.')
+st.dataframe(
+    view,
+    hide_index=True,
+    use_container_width=True,
+    column_config={
+        'p_over': st.column_config.NumberColumn('Hit rate', format='%.2f'),
+        'p_over_weighted': st.column_config.NumberColumn('Hit rate (weighted)', format='%.2f'),
+        'last_3_avg': st.column_config.NumberColumn('Last 3 avg', format='%.1f'),
+        'season_avg': st.column_config.NumberColumn('Season avg', format='%.1f'),
+        'delta': st.column_config.NumberColumn('Last 3 vs season', format='%+.1f'),
+        'implied_prob': st.column_config.NumberColumn('Implied', format='%.2f'),
+        'edge': st.column_config.NumberColumn('Edge', format='%+.2f'),
+        'edge_weighted': st.column_config.NumberColumn('Edge (weighted)', format='%+.2f'),
+    },
+)
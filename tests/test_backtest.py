@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+from nflstats.backtest import backtest_season, season_features, summarize
+
+
+def _long():
+    values = {('A', 'receiving_yards'): [10, 100, 20, 30, 200, 25], ('B', 'receptions'): [3, 5, 4, 6, 2, 7]}
+    rows = [
+        {'season': 2024, 'player': player, 'stat': stat, 'week': week, 'value': float(value)}
+        for (player, stat), games in values.items() for week, value in enumerate(games, start=1)
+    ]
+    return pd.DataFrame(rows)
+
+
+def test_proxy_line_sits_just_above_the_median_of_earlier_games():
+    f = season_features(_long())
+    a = f[f['player'] == 'A']
+    # Earlier games of week 5 are 10, 100, 20, 30: median 25, against a mean of 40
+    assert a['line'].tolist()[1:] == [10.5, 55.5, 20.5, 25.5, 30.5]
+    assert np.isnan(a['line'].iloc[0])
+    assert (f['line_source'] == 'proxy').all()
+
+
+def test_book_and_proxy_results_are_summarized_separately():
+    long = _long()
+    lines = pd.DataFrame({'season': [2024], 'week': [5], 'player_key': ['a'], 'stat': ['receiving_yards'],
+                          'line': [150.5], 'price': [2.0]})
+    bets = backtest_season(long, lines, {'always_over': lambda f: f['games_before'] >= 3})
+    summary = summarize(bets)
+    book = summary.loc[('always_over', 'book')]
+    assert book['bets'] == 1 and book['profit'] == 1.0
+    assert summary.loc[('always_over', 'proxy'), 'bets'] == len(bets) - 1
@@ -0,0 +1,58 @@
+import asyncio
+import threading
+import time
+
+import pandas as pd
+
+from nflstats.batch_insights import run_slate
+from nflstats.insight_cache import InsightCache
+from nflstats.insights import insight_inputs
+
+
+def _inputs(player):
+    return insight_inputs(player, 'WR', 'BUF', 'Receiving Yards', 60.5, 2024, 5, 'MIA', 70, 65, 60, 4)
+
+
+def _chat_api(state, lock):
+    def respond(path, query, body):
+        prompt = body['messages'][-1]['content']
+        with lock:
+            state['calls'] += 1
+            state['in_flight'] += 1
+            state['peak'] = max(state['peak'], state['in_flight'])
+            rate_limited = 'Player 0 ' in prompt and not state['limited']
+            state['limited'] |= rate_limited
+        time.sleep(0.05)
+        with lock:
+            state['in_flight'] -= 1
+        if rate_limited:
+            return 429, {'retry-after': '0'}, {'error': {'message': 'slow down', 'type': 'rate_limit'}}
+        return 200, {}, {
+            'id': 'stub', 'object': 'chat.completion', 'created': 0, 'model': body['model'],
+            'choices': [{'index': 0, 'finish_reason': 'stop',
+                         'message': {'role': 'assistant', 'content': f"insight {state['calls']}"}}],
+        }
+    return respond
+
+
+def test_slate_runs_concurrently_within_the_semaphore(stub_server, tmp_path):
+    state = {'calls': 0, 'in_flight': 0, 'peak': 0, 'limited': False}
+    base_url = stub_server(_chat_api(state, threading.Lock()))
+    players = [f'Player {i} ' for i in range(12)]
+    slate = pd.DataFrame({'player': players + ['Nobody'], 'stat': 'Receiving Yards', 'line': 60.5})
+    inputs = [_inputs(player) for player in players] + [None]
+    cache = InsightCache(tmp_path / 'insights.sqlite')
+
+    results = asyncio.run(run_slate(slate, inputs, cache, concurrency=3, base_url=base_url, api_key='key'))
+
+    assert 1 < state['peak'] <= 3
+    # Twelve prompts plus one retry after the 429
+    assert state['calls'] == 13
+    assert [result['error'] for result in results[:-1]] == [None] * 12
+    assert results[-1]['error'] == 'no games for player/stat in season'
+    assert all(cache.get(inputs) is not None for inputs in inputs[:-1])
+
+    # A second run is served from the cache without calling the API
+    again = asyncio.run(run_slate(slate, inputs, cache, concurrency=3, base_url=base_url, api_key='key'))
+    assert state['calls'] == 13
+    assert all(result['cached'] for result in again[:-1])
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from nflstats.features import build_features, player_features, update_features
+from nflstats.incremental import appended_weeks, week_digests
+
+
+def _frame(seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for season in (2023, 2024):
+        for week in range(1, 8):
+            for player in ('A', 'B', 'C'):
+                # B has a bye in week 3 and C only debuts in week 6
+                if (player == 'B' and week == 3) or (player == 'C' and week < 6):
+                    continue
+                rows.append({'season': season, 'full_name': player, 'week': week})
+    frame = pd.DataFrame(rows)
+    for column in ('passing_yards', 'rushing_yards', 'receiving_yards', 'receptions',
+                   'passing_tds', 'rushing_tds', 'receiving_tds'):
+        frame[column] = rng.integers(0, 100, len(frame)).astype('float32')
+    return frame
+
+
+def test_appended_weeks_update_matches_full_build():
+    frame = _frame()
+    full = build_features(frame)
+    for last_week in (3, 5, 6):
+        old = frame[(frame['season'] == 2023) | (frame['week'] <= last_week)]
+        table = build_features(old)
+        for season, week in appended_weeks(week_digests(old), week_digests(frame)):
+            table = update_features(table, frame, season, week)
+        pd.testing.assert_frame_equal(table, full, check_exact=False, rtol=1e-5)
+
+
+def test_features_match_pandas_rolling_and_ewm():
+    frame = _frame()
+    latest = player_features(build_features(frame), 2024, 'A', 'receiving_yards')
+    values = frame[(frame['season'] == 2024) & (frame['full_name'] == 'A')]['receiving_yards'].astype('float64')
+    assert latest['games'] == 7
+    assert np.isclose(latest['season_avg'], values.mean())
+    assert np.isclose(latest['std'], values.std())
+    assert np.isclose(latest['last_3'], values.tail(3).mean())
+    assert player_features(build_features(frame), 2024, 'Nobody', 'receiving_yards') is None
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+from nflstats.hit_prob import OutcomeTable
+
+YARDS = {'A': [40, 75, 60, 60, 90], 'B': [10, 0, 25]}
+
+
+def _frame():
+    rows = [
+        {'season': 2024, 'full_name': player, 'week': week, 'receiving_yards': float(yards),
+         'rushing_tds': 0.0, 'receiving_tds': float(week % 2)}
+        for player, games in YARDS.items() for week, yards in enumerate(games, start=1)
+    ]
+    return pd.DataFrame(rows)
+
+
+def test_over_counts_match_a_direct_count():
+    table = OutcomeTable(_frame(), stats=['receiving_yards', 'total_tds'])
+    lines = np.array([-1, 0, 39.5, 60, 60.5, 90, 100])
+    result = table.over(2024, 'A', 'receiving_yards', lines)
+    games = np.array(YARDS['A'])
+    # A push (value == line) is not an over
+    assert result['hits'].tolist() == [(games > line).sum() for line in lines]
+    assert (result['games'] == 5).all()
+    np.testing.assert_allclose(result['p_over'], result['hits'] / 5)
+    assert table.over(2024, 'A', 'total_tds', 0.5)['hits'] == 3
+
+
+def test_weighted_probability_favours_recent_games():
+    table = OutcomeTable(_frame(), stats=['receiving_yards'], half_life=1)
+    weights = 0.5 ** np.arange(len(YARDS['A']))[::-1]
+    expected = weights[np.array(YARDS['A']) > 70].sum() / weights.sum()
+    result = table.over(2024, 'A', 'receiving_yards', 70)
+    assert np.isclose(result['p_over_weighted'], expected)
+    assert np.isclose(result['fair_odds'], 1 / expected)
+
+
+def test_over_many_matches_over_and_handles_unknown_players():
+    table = OutcomeTable(_frame(), stats=['receiving_yards'])
+    queries = pd.DataFrame({
+        'season': [2024] * 6 + [2023],
+        'player': ['A', 'A', 'B', 'B', 'B', 'Nobody', 'A'],
+        'stat': 'receiving_yards',
+        'line': [-5, 60, -5, 10, 500, 10, 10],
+    })
+    batch = table.over_many(queries)
+    for row, query in zip(batch.itertuples(), queries.itertuples()):
+        single = table.over(query.season, query.player, query.stat, query.line)
+        assert row.hits == single['hits'] and row.games == single['games']
+    assert batch['hits'].tolist() == [5, 2, 3, 1, 0, 0, 0]
+    assert batch['p_over'].iloc[-2:].isna().all()
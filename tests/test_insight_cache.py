@@ -0,0 +1,45 @@
+import threading
+
+from nflstats.insight_cache import InsightCache
+from nflstats.insights import insight_inputs
+
+
+def _inputs(i):
+    return insight_inputs(f'Player {i}', 'WR', 'BUF', 'Receiving Yards', 60.5, 2024, 5, 'MIA', 70, 65, 60, 4)
+
+
+def test_hits_misses_and_expiry(tmp_path):
+    cache = InsightCache(tmp_path / 'insights.sqlite', ttl_seconds=3600)
+    assert cache.get(_inputs(1)) is None
+    cache.put(_inputs(1), 'text')
+    assert cache.get(_inputs(1)) == 'text'
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'hit_rate': 0.5, 'entries': 1}
+
+    cache.ttl_seconds = -1
+    assert cache.get(_inputs(1)) is None
+    assert cache.stats()['entries'] == 0
+
+
+def test_session_threads_share_the_cache_safely(tmp_path):
+    cache = InsightCache(tmp_path / 'insights.sqlite', max_entries=10000)
+    start = threading.Barrier(8)
+    errors = []
+
+    def session(n):
+        start.wait()
+        try:
+            for i in range(100):
+                cache.get(_inputs(n * 100 + i))
+                cache.put(_inputs(n * 100 + i), f'insight {n} {i}')
+                cache.stats()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=session, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert cache.stats() == {'hits': 0, 'misses': 800, 'hit_rate': 0.0, 'entries': 800}
+    assert cache.get(_inputs(703)) == 'insight 7 3'
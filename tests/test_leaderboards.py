@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+from nflstats.leaderboards import Leaderboard, ordinal
+
+
+def _frame(seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for i in range(12):
+        position = ['WR', 'RB', 'TE'][i % 3]
+        for week in range(1, 7):
+            # Player 0 misses week 5
+            if i == 0 and week == 5:
+                continue
+            rows.append({'season': 2024, 'full_name': f'P{i}', 'week': week, 'position': position})
+    frame = pd.DataFrame(rows)
+    frame['receiving_yards'] = rng.integers(0, 150, len(frame)).astype('float32')
+    frame['rushing_tds'] = 0.0
+    frame['receiving_tds'] = 0.0
+    return frame
+
+
+def _expected(frame, position, weeks):
+    rows = frame[(frame['position'] == position) & frame['week'].isin(weeks)]
+    totals = rows.groupby('full_name')['receiving_yards'].sum()
+    return totals.sort_values(ascending=False, kind='stable')
+
+
+def test_top_matches_a_groupby_for_every_window():
+    frame = _frame()
+    board = Leaderboard(frame, stats=['receiving_yards'])
+    for window, weeks in (('Week', [5]), ('Last 4 weeks', [2, 3, 4, 5]), ('Season', [1, 2, 3, 4, 5])):
+        top = board.top(2024, 5, 'WR', 'receiving_yards', window, k=3)
+        expected = _expected(frame, 'WR', weeks)
+        assert top['total'].tolist() == expected.head(3).tolist()
+        assert top['rank'].tolist() == [1, 2, 3]
+    # The player who sat out week 5 has no row in that week's block
+    assert 'P0' not in board.top(2024, 5, 'WR', 'receiving_yards', 'Week', k=10)['player'].tolist()
+    assert board.top(2024, 5, 'QB', 'receiving_yards').empty
+
+
+def test_percentile_is_the_share_at_or_below_a_total():
+    frame = _frame()
+    board = Leaderboard(frame, stats=['receiving_yards'])
+    expected = _expected(frame, 'RB', range(1, 7))
+    lowest, highest = expected.index[-1], expected.index[0]
+    assert board.percentile(2024, 6, highest, 'receiving_yards')['percentile'] == 100
+    assert board.percentile(2024, 6, lowest, 'receiving_yards')['percentile'] == 25
+    assert board.percentile(2024, 6, lowest, 'receiving_yards')['rank'] == 4
+    assert board.percentile(2024, 6, 'Nobody', 'receiving_yards') is None
+
+
+def test_ordinal_suffixes():
+    assert [ordinal(n) for n in (1, 2, 3, 4, 11, 12, 13, 21, 22, 23, 100, 101, 111)] == [
+        '1st', '2nd', '3rd', '4th', '11th', '12th', '13th', '21st', '22nd', '23rd', '100th', '101st', '111th',
+    ]
@@ -0,0 +1,67 @@
+from nflstats.insights import insight_inputs
+from nflstats.llm import CircuitBreaker, InsightClient
+
+INPUTS = insight_inputs('Player 1', 'WR', 'BUF', 'Receiving Yards', 60.5, 2024, 5, 'MIA', 70, 65, 60, 4)
+
+
+def _client(breaker, chunks=None, error=None):
+    client = InsightClient('key', breaker=breaker)
+
+    def stream_llm(inputs):
+        yield from chunks or []
+        if error is not None:
+            raise error
+
+    client._stream_llm = stream_llm
+    return client
+
+
+def test_breaker_opens_after_threshold_and_allows_one_trial():
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=60)
+    breaker.record_failure()
+    assert breaker.state == 'closed' and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == 'open' and not breaker.allow()
+
+    breaker.reset_seconds = 0
+    assert breaker.state == 'half_open'
+    assert breaker.allow()
+    assert not breaker.allow()
+    # A failed trial reopens the breaker; a successful one closes it
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == 'closed' and breaker.failures == 0
+
+
+def test_stream_falls_back_and_records_failure():
+    breaker = CircuitBreaker(failure_threshold=1)
+    status = {}
+    text = ''.join(_client(breaker, ['Some ', 'text'], RuntimeError('boom')).stream(INPUTS, status))
+    assert text.startswith('Some text\n\n---\n\n')
+    assert status['source'] == 'fallback'
+    assert breaker.state == 'open'
+
+    status = {}
+    assert ''.join(_client(breaker, ['never shown']).stream(INPUTS, status)) != 'never shown'
+    assert status['source'] == 'fallback'
+
+
+def test_closing_a_half_open_trial_mid_stream_releases_it():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0)
+    breaker.record_failure()
+    stream = _client(breaker, ['first ', 'second']).stream(INPUTS, {})
+    assert next(stream) == 'first '
+    assert not breaker.allow()
+    stream.close()
+    assert breaker.state == 'half_open'
+    assert breaker.allow()
+
+
+def test_successful_stream_closes_the_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0)
+    breaker.record_failure()
+    status = {}
+    assert ''.join(_client(breaker, ['all ', 'good']).stream(INPUTS, status)) == 'all good'
+    assert status['source'] == 'llm'
+    assert breaker.state == 'closed'
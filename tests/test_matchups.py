@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from nflstats.incremental import appended_weeks, week_digests
+from nflstats.matchups import MATCHUP_STATS, build_matchup_cube, matchup_for, update_matchup_cube
+
+
+def _weekly(seed=0, weeks=4):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for season in (2023, 2024):
+        for week in range(1, weeks + 1):
+            for defense in ('BUF', 'KC', 'MIA', 'NYJ'):
+                # MIA is off in week 2, and the first TE rows only show up in week 3
+                if defense == 'MIA' and week == 2:
+                    continue
+                for position in ('QB', 'RB', 'WR') + (('TE',) if week >= 3 else ()):
+                    rows.append({'season': season, 'week': week, 'opponent_team': defense, 'position': position})
+    weekly = pd.DataFrame(rows)
+    for stat in MATCHUP_STATS:
+        if stat != 'total_tds':
+            weekly[stat] = rng.integers(0, 120, len(weekly)).astype('float32')
+    return weekly
+
+
+def test_appended_weeks_update_matches_full_build():
+    weekly = _weekly()
+    for last_week in (1, 2, 3):
+        old = weekly[(weekly['season'] == 2023) | (weekly['week'] <= last_week)]
+        cube = build_matchup_cube(old)
+        for season, week in appended_weeks(week_digests(old), week_digests(weekly)):
+            cube = update_matchup_cube(cube, weekly, season, week)
+        pd.testing.assert_frame_equal(cube, build_matchup_cube(weekly))
+
+
+def test_changed_earlier_week_is_not_appendable():
+    weekly = _weekly()
+    old = weekly[weekly['week'] <= 3]
+    corrected = weekly.copy()
+    corrected.loc[0, 'passing_yards'] += 1
+    assert appended_weeks(week_digests(old), week_digests(weekly)) == [(2023, 4), (2024, 4)]
+    assert appended_weeks(week_digests(old), week_digests(corrected)) is None
+    assert appended_weeks(week_digests(weekly), week_digests(old)) is None
+
+
+def test_matchup_after_a_bye_reads_the_last_played_week():
+    weekly = _weekly(weeks=4)
+    cube = build_matchup_cube(weekly)
+    # The next game is in week 6 after a week 5 bye, so the week before it is not played yet
+    after_bye = matchup_for(cube, 2024, 5, 'BUF', 'WR')
+    assert after_bye is not None
+    assert after_bye.equals(matchup_for(cube, 2024, 4, 'BUF', 'WR'))
+    assert after_bye['games'] == 4
+    assert matchup_for(cube, 2024, 2, 'MIA', 'WR')['games'] == 1
+    assert matchup_for(cube, 2022, 5, 'BUF', 'WR') is None
+    assert matchup_for(cube, 2024, 5, 'BUF', 'K') is None
@@ -0,0 +1,47 @@
+from collections import Counter
+
+from nflstats.odds import OddsIngestor
+
+
+def _odds_api(calls):
+    def respond(path, query, body):
+        calls[path] += 1
+        if path.endswith('/events'):
+            return 200, {'x-requests-remaining': 20, 'x-requests-used': 1, 'x-requests-last': 1}, [
+                {'id': 'flaky'}, {'id': 'down'}, {'id': 'free'},
+            ]
+        event_id = path.split('/')[-2]
+        # Failed attempts are charged too
+        if event_id == 'flaky' and calls[path] == 1:
+            return 503, {'x-requests-remaining': 19, 'x-requests-last': 2}, {'message': 'try again'}
+        if event_id == 'down':
+            return 500, {'x-requests-remaining': 18 - calls[path], 'x-requests-last': 1}, {'message': 'broken'}
+        if event_id == 'free':
+            # No x-requests-last: the call must not be charged the previous call's cost
+            return 200, {'x-requests-remaining': 14}, {'id': event_id, 'bookmakers': []}
+        return 200, {'x-requests-remaining': 18, 'x-requests-used': 3, 'x-requests-last': 2}, {
+            'id': event_id, 'bookmakers': [],
+        }
+    return respond
+
+
+def test_slate_retries_transient_errors_and_tracks_quota(stub_server):
+    calls = Counter()
+    ingestor = OddsIngestor('key', base_url=stub_server(_odds_api(calls)), max_workers=1,
+                            retries=2, backoff_factor=0)
+    slate = ingestor.fetch_slate('americanfootball_nfl')
+
+    assert [event['id'] for event in slate] == ['flaky', 'free']
+    assert calls['/v4/sports/americanfootball_nfl/events/flaky/odds'] == 2
+    assert calls['/v4/sports/americanfootball_nfl/events/down/odds'] == 3
+    # Every attempt counts: events, two for flaky, three for down and one for free
+    assert ingestor.requests_made == 7
+    assert ingestor.cost == 1 + 2 + 2 + 3
+    assert ingestor.quota == {'remaining': 14, 'used': 3, 'last_cost': 1}
+
+
+def test_slate_stops_when_quota_is_exhausted(stub_server):
+    calls = Counter()
+    ingestor = OddsIngestor('key', base_url=stub_server(_odds_api(calls)), min_remaining=20)
+    assert ingestor.fetch_slate('americanfootball_nfl') == []
+    assert sum(calls.values()) == 1
@@ -0,0 +1,57 @@
+import threading
+
+import pandas as pd
+
+from nflstats import odds_history
+from nflstats.props import OUTCOME_COLUMNS
+
+
+def _outcomes(rows):
+    return pd.DataFrame([
+        {'commence_time': '2024-09-08T17:00:00Z', 'home_team': 'BUF', 'away_team': 'ARI', 'book': book,
+         'market': 'player_rec_yds', 'player': 'Stefon Diggs', 'player_key': 'stefon diggs', 'side': 'Over',
+         'event_id': event_id, 'point': point, 'price': 1.91}
+        for event_id, book, point in rows
+    ], columns=OUTCOME_COLUMNS)
+
+
+def test_line_history_is_scoped_to_one_event(tmp_path):
+    conn = odds_history.connect(tmp_path / 'odds.sqlite')
+    odds_history.record_snapshot(conn, _outcomes([('week1', 'fd', 60.5), ('week2', 'fd', 70.5)]), fetched_at=1)
+    odds_history.record_snapshot(conn, _outcomes([('week1', 'fd', 62.5), ('week2', 'fd', 68.5)]), fetched_at=2)
+    history = odds_history.line_history(conn, 'week2', 'Stefon Diggs', 'Receiving Yards')
+    assert history['point'].tolist() == [70.5, 68.5]
+    summary = odds_history.line_summary(history)
+    assert summary.loc[('week2', 'fd')].tolist() == [70.5, 68.5, -2.0]
+
+
+def test_one_claim_per_window_even_when_the_fetch_fails(tmp_path):
+    conn = odds_history.connect(tmp_path / 'odds.sqlite')
+    assert odds_history.claim_refresh(conn, 3600, now=1000)
+    # The claimed fetch recorded nothing, yet the window stays claimed
+    assert not odds_history.claim_refresh(conn, 3600, now=2000)
+    assert odds_history.claim_refresh(conn, 3600, now=4600)
+    odds_history.record_snapshot(conn, _outcomes([('week1', 'fd', 60.5)]), fetched_at=5000)
+    assert not odds_history.claim_refresh(conn, 3600, now=8000)
+
+
+def test_concurrent_sessions_claim_once_on_their_own_connections(tmp_path):
+    path = tmp_path / 'odds.sqlite'
+    odds_history.connect(path)
+    start = threading.Barrier(8)
+    claims, connections = [], []
+
+    def session():
+        conn = odds_history.thread_connection(path)
+        assert odds_history.thread_connection(path) is conn
+        connections.append(conn)
+        start.wait()
+        claims.append(odds_history.claim_refresh(conn, 3600))
+
+    threads = [threading.Thread(target=session) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(claims) == [False] * 7 + [True]
+    assert len({id(conn) for conn in connections}) == 8
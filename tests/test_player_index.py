@@ -0,0 +1,29 @@
+import pandas as pd
+
+from nflstats import snapshot
+from nflstats.player_index import PlayerIndex, sorted_player_frame
+
+
+def _weekly():
+    return pd.DataFrame({
+        'season': [2024, 2024, 2024, 2024, 2023, 2024],
+        'full_name': pd.Categorical(['B', 'A', 'A', None, 'A', 'A']),
+        'week': [1, 2, 1, 1, 1, 2],
+        'position': pd.Categorical(['WR', 'RB', 'RB', 'QB', 'RB', 'RB']),
+        'receiving_yards': [10.0, 20.0, 30.0, 40.0, 50.0, 60.0],
+    })
+
+
+def test_presorted_snapshot_index_matches_a_fresh_build(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot, 'SNAPSHOT_DIR', tmp_path)
+    roster = pd.DataFrame({'full_name': ['A', 'B'], 'season': [2024, 2024], 'team': ['BUF', 'KC']})
+    token = ('weekly', 1)
+    snapshot.write_snapshot('player_frame', token, sorted_player_frame(_weekly()))
+    shared = PlayerIndex(snapshot.read_snapshot('player_frame', token), roster, presorted=True)
+    built = PlayerIndex(_weekly(), roster)
+
+    assert shared.slices == built.slices == {(2023, 'A'): (0, 1), (2024, 'A'): (1, 3), (2024, 'B'): (3, 4)}
+    # Repeated (season, player, week) rows keep the first one
+    assert shared.rows(2024, 'A')['receiving_yards'].tolist() == [30.0, 20.0]
+    pd.testing.assert_frame_equal(shared.frame, built.frame)
+    assert shared.nbytes < 10_000
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from nflstats.scoring import HALF_PPR, PPR, PRESETS, STANDARD, ScoringEngine, rule_set_hash
+
+
+def _frame():
+    return pd.DataFrame({
+        'position': ['WR', 'TE', 'QB', 'RB'],
+        'receptions': [8, 6, 0, 3],
+        'receiving_yards': [120, 45, 0, 20],
+        'receiving_tds': [1, 0, 0, 0],
+        'passing_yards': [0, 0, 310, 0],
+        'passing_tds': [0, 0, 2, 0],
+        'interceptions': [0, 0, 1, 0],
+        'rushing_yards': [0, 0, 12, 101],
+        'rushing_tds': [0, 0, 0, 1],
+    }, index=[10, 11, 12, 13])
+
+
+def test_presets_score_like_a_hand_calculation():
+    engine = ScoringEngine(_frame())
+    standard = engine.points(STANDARD)
+    assert standard.index.tolist() == [10, 11, 12, 13]
+    np.testing.assert_allclose(standard, [18.0, 4.5, 12.4 + 8 - 2 + 1.2, 2.0 + 10.1 + 6])
+    np.testing.assert_allclose(engine.points(PPR) - standard, [8, 6, 0, 3])
+    np.testing.assert_allclose(engine.points(HALF_PPR) - standard, [4, 3, 0, 1.5])
+    # The TE premium only changes tight ends
+    np.testing.assert_allclose(engine.points(PRESETS['TE Premium (PPR)']) - engine.points(PPR), [0, 3, 0, 0])
+    # Bonuses: the WR's 120 receiving, the QB's 310 passing and the RB's 101 rushing yards
+    np.testing.assert_allclose(engine.points(PRESETS['PPR + Yardage Bonuses']) - engine.points(PPR), [3, 0, 3, 3])
+
+
+def test_rule_sets_are_cached_by_content():
+    engine = ScoringEngine(_frame(), max_cached=2)
+    reordered = {'bonuses': [], 'position_points': {}, 'points': dict(reversed(list(PPR['points'].items())))}
+    assert rule_set_hash(reordered) == rule_set_hash(PPR)
+    engine.points(PPR)
+    engine.points(reordered)
+    assert len(engine._cache) == 1
+    engine.points(STANDARD)
+    engine.points(HALF_PPR)
+    assert len(engine._cache) == 2
+
+
+def test_unknown_scoring_column_is_rejected():
+    with pytest.raises(ValueError, match='not_a_stat'):
+        ScoringEngine(_frame()).points({'points': {'not_a_stat': 1}, 'position_points': {}, 'bonuses': []})
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+from nflstats.player_index import PlayerIndex
+from nflstats.shared import SharedFrameCache
+
+
+def _frame(rows):
+    return pd.DataFrame({'value': np.zeros(rows, dtype='float64')})
+
+
+def test_new_token_replaces_entry():
+    cache = SharedFrameCache(max_bytes=10 ** 6)
+    first = cache.get('weekly', 1, lambda: _frame(10))
+    assert cache.get('weekly', 1, lambda: _frame(20)) is first
+    second = cache.get('weekly', 2, lambda: _frame(20))
+    assert len(second) == 20
+    assert cache.stats()['entries'] == ['weekly']
+
+
+def test_least_recently_used_entry_is_evicted_over_cap():
+    cache = SharedFrameCache(max_bytes=2000)
+    cache.get('a', 1, lambda: _frame(100))
+    cache.get('b', 1, lambda: _frame(100))
+    cache.get('a', 1, lambda: _frame(100))
+    cache.get('c', 1, lambda: _frame(100))
+    assert cache.stats()['entries'] == ['a', 'c']
+    assert cache.stats()['evictions'] == 1
+
+
+def test_player_rows_are_safe_to_modify():
+    df = pd.DataFrame({
+        'season': [2024, 2024, 2024], 'week': [2, 1, 1], 'full_name': ['A', 'A', 'B'],
+        'receiving_yards': [10.0, 20.0, 30.0],
+    })
+    index = PlayerIndex(df, pd.DataFrame({'full_name': ['A'], 'season': [2024]}))
+    rows = index.rows(2024, 'A')
+    assert rows['week'].tolist() == [1, 2]
+    rows['extra'] = 1
+    rows.loc[:, 'receiving_yards'] = 0.0
+    assert 'extra' not in index.frame.columns
+    assert index.frame['receiving_yards'].tolist() == [20.0, 10.0, 30.0]
+
+
+def test_peek_returns_entry_whatever_its_token():
+    cache = SharedFrameCache(max_bytes=10 ** 6)
+    assert cache.peek('weekly') is None
+    first = cache.get('weekly', 1, lambda: _frame(10))
+    token, value = cache.peek('weekly')
+    assert token == 1 and value is first
+    assert cache.stats()['hits'] == 0
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+from nflstats.defense import ALLOWED_COLUMNS
+from nflstats.simulate import FACTOR_BOUNDS, league_allowed, opponent_factor, simulate_slate
+
+
+def _tasks(count=7, seed=1):
+    rng = np.random.default_rng(seed)
+    tasks = []
+    for i in range(count):
+        values = rng.gamma(2.0, 30.0, 10) if i % 2 else rng.poisson(1.5, 10).astype('float64')
+        weights = np.full(len(values), 1 / len(values))
+        tasks.append({'values': values, 'weights': weights, 'factor': 1.1, 'line': 45.5 if i % 2 else 1.5,
+                      'count': not i % 2, 'opponent': None})
+    return tasks
+
+
+def test_results_do_not_depend_on_workers_or_chunking():
+    tasks = _tasks()
+    serial = simulate_slate(tasks, samples=2000, seed=7, workers=1)
+    assert simulate_slate(tasks, samples=2000, seed=7, workers=2, chunk_size=3) == serial
+    assert simulate_slate(tasks, samples=2000, seed=7, workers=1, chunk_size=1) == serial
+    assert simulate_slate(tasks, samples=2000, seed=8, workers=1) != serial
+
+
+def test_missing_tasks_stay_in_place():
+    tasks = _tasks(4)
+    with_gaps = [None, tasks[0], None, tasks[1], tasks[2], None, tasks[3]]
+    results = simulate_slate(with_gaps, samples=1000, seed=3, workers=2, chunk_size=2)
+    assert [result is None for result in results] == [task is None for task in with_gaps]
+    assert all(0.0 <= result['p_over'] <= 1.0 for result in results if result is not None)
+
+
+def _defense_table():
+    # Per-game averages allowed through week 4: KC allows a lot, BUF very little, NYJ has not played
+    allowed = {'KC': 3.0, 'BUF': 0.1, 'MIA': 1.0, 'NYJ': 0.0}
+    rows = [
+        {'season': 2024, 'team': team, 'as_of_week': 4, 'games': 0 if team == 'NYJ' else 4,
+         **{f'avg_{col}': 100.0 * scale for col in ALLOWED_COLUMNS}}
+        for team, scale in allowed.items()
+    ]
+    return pd.DataFrame(rows).set_index(['season', 'team', 'as_of_week'])
+
+
+def test_opponent_factor_is_bounded_and_neutral_when_unknown():
+    table = _defense_table()
+    league = league_allowed(table)
+    column = 'receiving_yards'
+    factors = {team: opponent_factor(table, league, 2024, team, 4, column) for team in ('KC', 'BUF', 'MIA')}
+    assert all(FACTOR_BOUNDS[0] <= factor <= FACTOR_BOUNDS[1] for factor in factors.values())
+    assert factors['KC'] == FACTOR_BOUNDS[1] and factors['BUF'] == FACTOR_BOUNDS[0]
+    assert factors['BUF'] < factors['MIA'] < factors['KC']
+
+    assert opponent_factor(table, league, 2024, 'NYJ', 4, column) == 1.0
+    assert opponent_factor(table, league, 2024, 'DAL', 4, column) == 1.0
+    assert opponent_factor(table, league, 2024, 'KC', 9, column) == 1.0
+    assert opponent_factor(table, league, 2024, 'KC', 4, None) == 1.0
+    assert opponent_factor(table, league, 2024, None, 4, column) == 1.0
@@ -0,0 +1,94 @@
+import os
+import threading
+import time
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from nflstats import store
+
+
+@pytest.fixture
+def fetches(tmp_path, monkeypatch):
+    monkeypatch.setattr(store, 'DATA_DIR', tmp_path)
+    calls = []
+
+    def fetch(seasons):
+        calls.append(list(seasons))
+        return pd.DataFrame({'season': seasons * 2, 'value': [1.0, 2.0] * len(seasons)})
+
+    monkeypatch.setitem(store.FETCHERS, 'test', fetch)
+    return calls
+
+
+def _set_mtime(dataset, season, timestamp):
+    os.utime(store.partition_path(dataset, season), (timestamp, timestamp))
+
+
+def test_completed_season_is_fetched_once(fetches):
+    now = store.season_end(2022) + 86400
+    store.refresh('test', [2022], now=now)
+    store.refresh('test', [2022], now=now + 10 * store.REFRESH_SECONDS)
+    assert fetches == [[2022]]
+
+
+def test_partition_written_during_season_refreshes_after_it_ends(fetches):
+    mid_season = time.mktime(date(2022, 11, 1).timetuple())
+    store.refresh('test', [2022], now=mid_season)
+    _set_mtime('test', 2022, mid_season)
+
+    after = store.season_end(2022) + 86400
+    store.refresh('test', [2022], now=after)
+    store.refresh('test', [2022], now=after + 60)
+    assert fetches == [[2022], [2022]]
+
+
+def test_in_progress_season_refreshes_after_ttl(fetches):
+    now = time.mktime(date(2024, 10, 1).timetuple())
+    store.refresh('test', [2024], now=now)
+    _set_mtime('test', 2024, now)
+    store.refresh('test', [2024], now=now + 60)
+    assert len(fetches) == 1
+    store.refresh('test', [2024], now=now + store.REFRESH_SECONDS + 1)
+    assert len(fetches) == 2
+
+
+def test_fingerprint_changes_when_a_partition_is_rewritten(fetches):
+    now = store.season_end(2021) + 86400
+    first = store.refresh('test', [2021], now=now)
+    assert first == store.fingerprint('test', [2021])
+
+    _set_mtime('test', 2021, store.season_end(2021) - 1)
+    second = store.refresh('test', [2021], now=now)
+    assert second != first
+    assert store.read('test', [2021])['value'].tolist() == [1.0, 2.0]
+
+
+def test_concurrent_refreshes_fetch_and_write_a_partition_once(fetches, monkeypatch):
+    fetch = store.FETCHERS['test']
+    start = threading.Barrier(4)
+
+    def slow_fetch(seasons):
+        time.sleep(0.05)
+        return fetch(seasons)
+
+    monkeypatch.setitem(store.FETCHERS, 'test', slow_fetch)
+    errors = []
+
+    def session():
+        start.wait()
+        try:
+            store.refresh('test', [2024])
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=session) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert fetches == [[2024]]
+    assert store.read('test', [2024])['value'].tolist() == [1.0, 2.0]
+    assert not list(store.partition_path('test', 2024).parent.glob('*.tmp'))
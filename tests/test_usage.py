@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from nflstats.schema import apply_schema
+from nflstats.usage import USAGE_COLUMNS, USAGE_SCHEMA, aggregate_usage
+
+
+def _pbp():
+    plays = [
+        # posteam, play_type, yardline_100, receiver, rusher, complete, air_yards, two_point
+        ('BUF', 'pass', 50, 'r1', None, 1, 10.0, 0),
+        ('BUF', 'pass', 15, 'r1', None, 0, 5.0, 0),
+        ('BUF', 'pass', 30, 'r2', None, 1, 20.0, 0),
+        ('BUF', 'run', 4, None, 'b1', 0, np.nan, 0),
+        ('BUF', 'run', 40, None, 'r1', 0, np.nan, 0),
+        ('BUF', 'pass', 2, 'r2', None, 1, 2.0, 1),
+        ('MIA', 'pass', 60, 'm1', None, 1, 8.0, 0),
+    ]
+    frame = pd.DataFrame(plays, columns=['posteam', 'play_type', 'yardline_100', 'receiver_player_id',
+                                         'rusher_player_id', 'complete_pass', 'air_yards', 'two_point_attempt'])
+    return frame.assign(season=2024, week=1, season_type='REG', pass_attempt=0, rush_attempt=0)
+
+
+def test_usage_shares_and_red_zone_counts():
+    usage = aggregate_usage(_pbp()).set_index('player_id')
+    assert list(usage.columns[3:]) == USAGE_COLUMNS
+    # Two-point tries are left out
+    assert usage.loc['r2', 'targets'] == 1 and usage.loc['r1', 'targets'] == 2
+    assert np.isclose(usage.loc['r1', 'target_share'], 2 / 3)
+    assert np.isclose(usage.loc['r1', 'air_yards_share'], 15 / 35)
+    assert usage.loc['r1', 'red_zone_touches'] == 0
+    assert usage.loc['b1', 'goal_line_carries'] == 1 and usage.loc['b1', 'carry_share'] == 0.5
+    assert usage.groupby('team')['target_share'].sum().round(6).eq(1).all()
+
+
+def test_usage_schema_is_compact():
+    usage = apply_schema(aggregate_usage(_pbp()), USAGE_SCHEMA)
+    assert usage['team'].dtype == 'category' and usage['targets'].dtype == 'int16'
+    assert usage['target_share'].dtype == 'float32'